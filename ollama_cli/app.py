@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-import json
 import os
 import re
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional
 
 import requests
 from prompt_toolkit import PromptSession
@@ -16,29 +14,19 @@ from prompt_toolkit.formatted_text import HTML
 from prompt_toolkit.history import FileHistory
 from rich.box import ROUNDED
 from rich.console import Console
-from rich.live import Live
-from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 from rich.prompt import Confirm
 from rich.rule import Rule
-from rich.syntax import Syntax
 from rich.table import Table
-from rich.text import Text
 
 from .clipboard import ClipboardTracker
 from .templates import generate_html_export as _generate_html_template
 from .commands import CommandRegistry, CommandHandlers, SmartCompleter
 from .logging_utils import set_log_level, setup_logging
 from .models import TokenStats
-from .security import (
-    SecurityError,
-    encrypt_text,
-    get_encryption_key,
-    mask_messages,
-    mask_sensitive_text,
-)
-from .session_store import SessionMeta, SessionStore
+from .security import SecurityError
+from .session_store import SessionMeta, SessionStore, format_display_time
 from .storage import (
     load_config,
     load_favorites,
@@ -49,7 +37,9 @@ from .storage import (
 from .utils import (
     estimate_message_tokens,
     format_size,
+    create_http_session,
     get_model_prompt,
+    json_loads,
 )
 
 # Refactored modules
@@ -75,6 +65,7 @@ class ChatApp:
 
         self.prompts = load_prompts(self.paths, self.logger)
         self.favorites = load_favorites(self.paths, self.logger)
+        self._fav_keys = frozenset(self.favorites.favorites)
         migrate_history(self.paths, self.logger)
         self.session_store = SessionStore(self.paths, self.logger, self.config)
 
@@ -84,7 +75,17 @@ class ChatApp:
         self.session_id: Optional[str] = None
         self.session_tags: List[str] = []
         self.session: Optional[PromptSession] = None
+        self._completer: Optional[SmartCompleter] = None
+        self._theme_source = None
+        self._theme_colors: Dict[str, str] = {}
+        self._model_names_source = None
+        self._model_names: List[str] = []
+        self._model_names_set: FrozenSet[str] = frozenset()
         self.clipboard_tracker = ClipboardTracker()
+        self._last_clip_check = 0.0
+
+        # Shared HTTP session (keep-alive) for chat, summary, compare, benchmark
+        self.http = create_http_session()
 
         # Initialize refactored modules
         self.model_manager = ModelManager(
@@ -104,6 +105,7 @@ class ChatApp:
             prompts=self.prompts,
             token_stats=self.token_stats,
             get_theme=lambda: self.theme,
+            http=self.http,
         )
 
         self.ui_display = UIDisplay(
@@ -114,6 +116,7 @@ class ChatApp:
             prompts=self.prompts,
             token_stats=self.token_stats,
             get_theme=lambda: self.theme,
+            http=self.http,
         )
 
         # Legacy state accessors (for backward compatibility during transition)
@@ -196,9 +199,7 @@ class ChatApp:
         self.session = PromptSession(
             history=FileHistory(str(self.paths.history_file)),
             auto_suggest=AutoSuggestFromHistory(),
-            completer=SmartCompleter(
-                self.registry, self.favorites, self.models, self.config.profiles
-            ),
+            completer=self._get_completer(),
             complete_while_typing=False,
         )
 
@@ -265,13 +266,31 @@ class ChatApp:
                 self.console.print(f"\n[{self.theme['accent']}]Gorusuruz! 👋[/]\n")
                 break
 
+        self.chat_engine.shutdown()
         return 0
 
+    def _get_completer(self) -> SmartCompleter:
+        """Return the single completer, pointed at the current sources."""
+        if self._completer is None:
+            self._completer = SmartCompleter(
+                self.registry, self.favorites, self.models, self.config.profiles
+            )
+        else:
+            self._completer.refresh_models(self.models)
+            self._completer.refresh_favorites(self.favorites)
+            self._completer.refresh_profiles(self.config.profiles)
+        return self._completer
+
     def _check_clipboard(self) -> None:
         """Check for clipboard changes if monitoring is enabled."""
         if not self.config.clipboard_monitor:
             return
 
+        now = time.monotonic()
+        if now - self._last_clip_check < self.config.clipboard_poll_interval:
+            return
+        self._last_clip_check = now
+
         change = self.clipboard_tracker.check_change(self.logger)
         if not change:
             return
@@ -295,8 +314,8 @@ class ChatApp:
             return
 
         # Count non-system messages
-        conversation = [m for m in self.messages if m.get("role") != "system"]
-        if len(conversation) < self.config.auto_title_after + 1:
+        non_system = sum(1 for m in self.messages if m.get("role") != "system")
+        if non_system < self.config.auto_title_after + 1:
             return
 
         title = self.chat_engine.generate_title(self.messages)
@@ -307,14 +326,34 @@ class ChatApp:
     @property
     def theme(self) -> Dict[str, str]:
         active = self.config.themes.get(self.config.theme)
-        if active:
-            return active.model_dump()
-        fallback = next(iter(self.config.themes.values()))
-        return fallback.model_dump()
+        if not active:
+            active = next(iter(self.config.themes.values()))
+        # Dump once per active theme; every console.print reads a few colors
+        if active is not self._theme_source:
+            self._theme_colors = active.model_dump()
+            self._theme_source = active
+        return self._theme_colors
+
+    @property
+    def model_names(self) -> List[str]:
+        self._sync_model_names()
+        return self._model_names
+
+    @property
+    def model_names_set(self) -> FrozenSet[str]:
+        self._sync_model_names()
+        return self._model_names_set
+
+    def _sync_model_names(self) -> None:
+        # self.models is always replaced, never mutated, so identity marks a change
+        if self.models is not self._model_names_source:
+            self._model_names = [m["name"] for m in self.models]
+            self._model_names_set = frozenset(self._model_names)
+            self._model_names_source = self.models
 
     def handle_command(self, cmd: str) -> bool:
         cmd_lower = cmd.lower()
-        cmd_key = cmd_lower.split()[0]
+        cmd_key = cmd_lower.partition(" ")[0]
         command = self.registry.get(cmd_key)
         if command:
             return command.handler(cmd)
@@ -329,15 +368,19 @@ class ChatApp:
         if not cmd_lower.startswith("/"):
             return False
 
-        fav_shortcut = cmd_lower[1:].split()[0] if cmd_lower[1:] else ""
-        favs = self.favorites.favorites
-        if fav_shortcut in favs:
+        end = cmd_lower.find(" ", 1)
+        fav_shortcut = cmd_lower[1:end] if end != -1 else cmd_lower[1:]
+        if fav_shortcut in self._fav_keys:
             extra = cmd[len(fav_shortcut) + 1 :].strip()
-            user_input = f"{favs[fav_shortcut]} {extra}".strip()
+            user_input = f"{self.favorites.favorites[fav_shortcut]} {extra}".strip()
             self.send_user_message(user_input)
             return True
         return False
 
+    def refresh_favorite_keys(self) -> None:
+        """Rebuild the cached favorite shortcut set after favorites change."""
+        self._fav_keys = frozenset(self.favorites.favorites)
+
     # ─────────────────────────────────────────────────────────────
     # Delegated UI Display Methods
     # ─────────────────────────────────────────────────────────────
@@ -542,12 +585,7 @@ class ChatApp:
         table.add_column("Token", style=self.theme["muted"], justify="right", width=8)
 
         for i, session in enumerate(sessions, 1):
-            try:
-                updated = datetime.fromisoformat(session.updated_at).strftime(
-                    "%Y-%m-%d %H:%M"
-                )
-            except Exception:
-                updated = session.updated_at
+            updated = session.updated_display or format_display_time(session.updated_at)
             tags = ", ".join(session.tags) if session.tags else "-"
             table.add_row(
                 str(i),
@@ -598,6 +636,7 @@ class ChatApp:
             self.console.print(f"[{self.theme['error']}]Session bulunamadi[/]\n")
             return
 
+        self.chat_engine.cancel_summary_prefetch()
         self.session_id = meta.id
         self.session_tags = meta.tags
         self.chat_title = meta.title
@@ -607,9 +646,7 @@ class ChatApp:
         self.token_stats = TokenStats(**data.token_stats)
 
         self.models = self.get_models()
-        self.session.completer = SmartCompleter(
-            self.registry, self.favorites, self.models, self.config.profiles
-        )
+        self.session.completer = self._get_completer()
         self.apply_model_profiles(self.model)
         base_prompt = self._extract_base_system_prompt()
         if base_prompt:
@@ -688,7 +725,7 @@ class ChatApp:
 
                 for line in response.iter_lines():
                     if line:
-                        data = json.loads(line)
+                        data = json_loads(line)
                         if "pulling" in data.get("status", ""):
                             total = data.get("total", 0)
                             completed = data.get("completed", 0)
@@ -729,197 +766,14 @@ class ChatApp:
         return False
 
     def render_response(self, text: str) -> None:
-        code_pattern = r"```(\w+)?\n(.*?)```"
-        parts = []
-        last_end = 0
-
-        for match in re.finditer(code_pattern, text, re.DOTALL):
-            if match.start() > last_end:
-                parts.append(("text", text[last_end : match.start()]))
-
-            lang = match.group(1) or "text"
-            code = match.group(2).strip()
-            parts.append(("code", (lang, code)))
-            last_end = match.end()
-
-        if last_end < len(text):
-            parts.append(("text", text[last_end:]))
-
-        for part_type, content in parts:
-            if part_type == "text" and content.strip():
-                md = Markdown(content, code_theme="monokai")
-                self.console.print(md)
-            elif part_type == "code":
-                lang, code = content
-                self.console.print(
-                    Panel(
-                        Syntax(
-                            code,
-                            lang,
-                            theme="monokai",
-                            line_numbers=True,
-                            word_wrap=True,
-                        ),
-                        title=f"[dim]{lang}[/]" if lang != "text" else None,
-                        border_style=self.theme["muted"],
-                        box=ROUNDED,
-                        padding=(0, 1),
-                    )
-                )
+        """Delegate to chat_engine."""
+        self.chat_engine.render_response(text)
 
     def chat_stream(
         self, model: str, messages, temperature: Optional[float] = None
     ) -> Optional[str]:
-        host = self.config.ollama_host
-
-        try:
-            request_data = {
-                "model": model,
-                "messages": messages,
-                "stream": True,
-            }
-            if temperature is not None:
-                request_data["options"] = {"temperature": temperature}
-
-            response = requests.post(
-                f"{host}/api/chat",
-                json=request_data,
-                stream=True,
-                timeout=300,
-            )
-            response.raise_for_status()
-
-            self.console.print()
-            header = Text()
-            header.append("◉ ", style=f"bold {self.theme['assistant']}")
-            header.append(
-                model.split(":")[0].upper(), style=f"bold {self.theme['assistant']}"
-            )
-            self.console.print(header)
-            self.console.print(Rule(style=self.theme["muted"]))
-
-            full_response = ""
-            start_time = datetime.now()
-            data = {}
-
-            if self.config.render_markdown:
-                last_update = time.monotonic()
-                with Live(
-                    Markdown("", code_theme="monokai"),
-                    console=self.console,
-                    refresh_per_second=12,
-                ) as live:
-                    for line in response.iter_lines():
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                if "message" in data:
-                                    content = data["message"].get("content", "")
-                                    full_response += content
-                                    now = time.monotonic()
-                                    if now - last_update > 0.1 or "\n" in content:
-                                        live.update(
-                                            Markdown(
-                                                full_response, code_theme="monokai"
-                                            )
-                                        )
-                                        last_update = now
-
-                                if data.get("done"):
-                                    break
-                            except Exception:
-                                continue
-                    live.update(Markdown(full_response, code_theme="monokai"))
-            else:
-                in_code_block = False
-                code_buffer = ""
-                code_lang = ""
-
-                for line in response.iter_lines():
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            if "message" in data:
-                                content = data["message"].get("content", "")
-                                full_response += content
-
-                                for char in content:
-                                    if not in_code_block and full_response.endswith(
-                                        "```"
-                                    ):
-                                        in_code_block = True
-                                        code_buffer = ""
-                                        continue
-
-                                    if in_code_block:
-                                        code_buffer += char
-                                        if code_buffer.endswith("```"):
-                                            in_code_block = False
-                                            code_content = code_buffer[:-3]
-                                            lines = code_content.split("\n", 1)
-                                            if (
-                                                lines[0].strip().isalnum()
-                                                and len(lines[0].strip()) < 15
-                                            ):
-                                                code_lang = lines[0].strip()
-                                                code_content = (
-                                                    lines[1] if len(lines) > 1 else ""
-                                                )
-                                            else:
-                                                code_lang = "text"
-                                            self.console.print()
-                                            self.console.print(
-                                                Panel(
-                                                    Syntax(
-                                                        code_content.strip(),
-                                                        code_lang,
-                                                        theme="monokai",
-                                                        line_numbers=True,
-                                                        word_wrap=True,
-                                                    ),
-                                                    title=f"[dim]{code_lang}[/]"
-                                                    if code_lang != "text"
-                                                    else None,
-                                                    border_style=self.theme["muted"],
-                                                    box=ROUNDED,
-                                                    padding=(0, 1),
-                                                )
-                                            )
-                                            code_buffer = ""
-                                            code_lang = ""
-                                    else:
-                                        print(char, end="", flush=True)
-
-                            if data.get("done"):
-                                break
-                        except Exception:
-                            continue
-
-                print()
-
-            prompt_tokens = data.get("prompt_eval_count", 0)
-            completion_tokens = data.get("eval_count", 0)
-            self.token_stats.prompt_tokens += prompt_tokens
-            self.token_stats.completion_tokens += completion_tokens
-            self.token_stats.total_tokens += prompt_tokens + completion_tokens
-
-            if self.config.show_metrics:
-                elapsed = (datetime.now() - start_time).total_seconds()
-                tps = completion_tokens / elapsed if elapsed > 0 else 0
-                self.console.print(
-                    f"\n[{self.theme['muted']}]⏱ {elapsed:.1f}s  ◈ {completion_tokens} token  ⚡ {tps:.1f} t/s[/]"
-                )
-
-            self.console.print()
-            return full_response
-
-        except KeyboardInterrupt:
-            self.console.print(f"\n[{self.theme['accent']}]◼ Iptal[/]\n")
-            return full_response if full_response else None
-        except Exception as exc:
-            self.logger.exception("Chat stream hatasi")
-            self.console.print(f"\n[{self.theme['error']}]Hata: {exc}[/]\n")
-            return None
+        """Delegate to chat_engine."""
+        return self.chat_engine.chat_stream(model, messages, temperature)
 
     def init_conversation(self, model_name: str) -> List[Dict[str, object]]:
         """Initialize conversation, delegating to chat_engine for message creation."""
@@ -983,15 +837,16 @@ class ChatApp:
     def _find_summary_index(self) -> Optional[int]:
         for idx, msg in enumerate(self.messages):
             if msg.get("role") != "system":
-                continue
-            content = msg.get("content", "")
-            if isinstance(content, str) and content.startswith(SUMMARY_PREFIX):
+                return None
+            if self._is_summary_message(msg):
                 return idx
         return None
 
     def _find_base_system_index(self) -> Optional[int]:
         for idx, msg in enumerate(self.messages):
-            if msg.get("role") == "system" and not self._is_summary_message(msg):
+            if msg.get("role") != "system":
+                return None
+            if not self._is_summary_message(msg):
                 return idx
         return None
 
@@ -1041,62 +896,24 @@ class ChatApp:
         return to_summarize, keep
 
     def request_summary(self, messages: List[Dict[str, object]]) -> Optional[str]:
-        summary_model = self.config.summary_model or self.model
-        if not summary_model:
-            return None
-
-        summary_input = self._build_summary_input(messages)
-        payload = {
-            "model": summary_model,
-            "messages": [
-                {"role": "system", "content": self.config.summary_prompt},
-                {"role": "user", "content": summary_input},
-            ],
-            "stream": False,
-        }
-
-        try:
-            response = requests.post(
-                f"{self.config.ollama_host}/api/chat",
-                json=payload,
-                timeout=120,
-            )
-            response.raise_for_status()
-            data = response.json()
-            summary = data.get("message", {}).get("content", "").strip()
-            return summary or None
-        except Exception:
-            self.logger.exception("Ozetleme istegi basarisiz")
-            return None
-
-    def _build_summary_input(self, messages: List[Dict[str, object]]) -> str:
-        lines = []
-        if self.summary:
-            lines.append("Onceki ozet:")
-            lines.append(self.summary)
-            lines.append("")
-        lines.append("Mesajlar:")
-        for msg in messages:
-            role = "Kullanici" if msg.get("role") == "user" else "Asistan"
-            content = msg.get("content", "")
-            if isinstance(content, list):
-                content = "[Gorsel]"
-            lines.append(f"{role}: {content}")
-        lines.append("")
-        lines.append("Yeni, guncel bir ozet yaz.")
-        return "\n".join(lines)
+        """Delegate to chat_engine."""
+        self.chat_engine.model = self.model
+        return self.chat_engine.request_summary(messages)
 
     def extract_summary(self, messages: List[Dict[str, object]]) -> str:
         for msg in messages:
+            if msg.get("role") != "system":
+                break
             if self._is_summary_message(msg):
                 content = msg.get("content", "")
-                if isinstance(content, str):
-                    return content.replace(SUMMARY_PREFIX, "", 1).strip()
+                return content.replace(SUMMARY_PREFIX, "", 1).strip()
         return ""
 
     def _extract_base_system_prompt(self) -> str:
         for msg in self.messages:
-            if msg.get("role") == "system" and not self._is_summary_message(msg):
+            if msg.get("role") != "system":
+                break
+            if not self._is_summary_message(msg):
                 content = msg.get("content", "")
                 if isinstance(content, str):
                     return content
@@ -1117,6 +934,9 @@ class ChatApp:
         self.chat_engine.current_temperature = self.current_temperature
 
         response = self.chat_engine.send_user_message(content, images)
+        # Summarization replaces the engine's message list
+        self.messages = self.chat_engine.messages
+        self.summary = self.chat_engine.summary
 
         # Maybe autosave after response
         self.maybe_autosave()
@@ -1145,48 +965,8 @@ class ChatApp:
         return "\n".join(lines)
 
     def search_messages(self, keyword: str) -> None:
-        results = []
-        keyword_lower = keyword.lower()
-
-        for i, msg in enumerate(self.messages):
-            if msg["role"] == "system":
-                continue
-            content = msg.get("content", "")
-            if isinstance(content, str) and keyword_lower in content.lower():
-                results.append((i, msg))
-
-        if not results:
-            self.console.print(f"[{self.theme['muted']}]'{keyword}' bulunamadi[/]\n")
-            return
-
-        table = Table(box=ROUNDED, border_style=self.theme["primary"], padding=(0, 2))
-        table.add_column("#", style="bold cyan", width=4)
-        table.add_column("Rol", style=f"bold {self.theme['accent']}", width=10)
-        table.add_column("Icerik", style="white")
-
-        for idx, msg in results:
-            content = msg.get("content", "")[:100]
-            highlighted = re.sub(
-                f"({re.escape(keyword)})",
-                f"[bold {self.theme['accent']}]\\1[/]",
-                content,
-                flags=re.IGNORECASE,
-            )
-            role_color = (
-                self.theme["user"] if msg["role"] == "user" else self.theme["assistant"]
-            )
-            table.add_row(
-                str(idx), f"[{role_color}]{msg['role']}[/]", highlighted + "..."
-            )
-
-        self.console.print(
-            Panel(
-                table,
-                title=f"[bold]Arama: '{keyword}'[/]",
-                border_style=self.theme["primary"],
-            )
-        )
-        self.console.print()
+        """Delegate to ui_display."""
+        self.ui_display.search_messages(keyword, self.messages)
 
     def show_tokens(self) -> None:
         table = Table(box=ROUNDED, border_style=self.theme["primary"], padding=(0, 2))
@@ -1207,221 +987,22 @@ class ChatApp:
         self.console.print()
 
     def compare_models(self, question: str, model_names: List[str]) -> Dict[str, str]:
-        host = self.config.ollama_host
-        results: Dict[str, str] = {}
-
-        self.console.print(
-            f"\n[{self.theme['accent']}]🔀 {len(model_names)} model karsilastiriliyor...[/]\n"
-        )
-
-        def ask_model(model_name: str):
-            try:
-                prompt_info = get_model_prompt(model_name, self.prompts)
-                msgs = []
-                if prompt_info.get("system_prompt"):
-                    msgs.append(
-                        {"role": "system", "content": prompt_info["system_prompt"]}
-                    )
-                msgs.append({"role": "user", "content": question})
-
-                response = requests.post(
-                    f"{host}/api/chat",
-                    json={"model": model_name, "messages": msgs, "stream": False},
-                    timeout=120,
-                )
-                data = response.json()
-                return model_name, data.get("message", {}).get("content", "Yanit yok")
-            except Exception as exc:
-                self.logger.exception("Model karsilastirma hatasi: %s", model_name)
-                return model_name, f"Hata: {exc}"
-
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {executor.submit(ask_model, m): m for m in model_names}
-            for future in as_completed(futures):
-                model_name, response = future.result()
-                results[model_name] = response
-
-        for model_name, response in results.items():
-            prompt_info = get_model_prompt(model_name, self.prompts)
-            icon = prompt_info.get("icon", "🤖")
-            self.console.print(
-                Panel(
-                    response[:500] + ("..." if len(response) > 500 else ""),
-                    title=f"[bold]{icon} {model_name}[/]",
-                    border_style=self.theme["primary"],
-                    padding=(1, 2),
-                )
-            )
-
-        return results
+        """Delegate to ui_display."""
+        return self.ui_display.compare_models(question, model_names)
 
     def benchmark_model(
         self, model_name: str, prompt: str, runs: int
     ) -> Optional[Dict[str, object]]:
-        host = self.config.ollama_host
-        results = []
-
-        self.console.print(
-            f"[{self.theme['muted']}]Benchmark: {model_name} (x{runs})[/]"
+        """Delegate to ui_display."""
+        return self.ui_display.benchmark_model(
+            model_name, prompt, runs, self.model_manager.save_benchmark_result
         )
 
-        for run in range(1, runs + 1):
-            payload = {
-                "model": model_name,
-                "messages": [{"role": "user", "content": prompt}],
-                "stream": False,
-                "options": {"temperature": self.config.benchmark_temperature},
-            }
-            try:
-                start = time.perf_counter()
-                response = requests.post(
-                    f"{host}/api/chat",
-                    json=payload,
-                    timeout=self.config.benchmark_timeout,
-                )
-                response.raise_for_status()
-                data = response.json()
-                elapsed = time.perf_counter() - start
-                prompt_tokens = int(data.get("prompt_eval_count", 0) or 0)
-                completion_tokens = int(data.get("eval_count", 0) or 0)
-                total_tokens = prompt_tokens + completion_tokens
-                tps = completion_tokens / elapsed if elapsed > 0 else 0
-
-                result = {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "model": model_name,
-                    "prompt": prompt,
-                    "run": run,
-                    "elapsed": elapsed,
-                    "prompt_tokens": prompt_tokens,
-                    "completion_tokens": completion_tokens,
-                    "total_tokens": total_tokens,
-                    "tps": tps,
-                    "temperature": self.config.benchmark_temperature,
-                }
-                results.append(result)
-                self._save_benchmark_result(result)
-            except Exception as exc:
-                self.logger.exception("Benchmark hatasi: %s", model_name)
-                self.console.print(f"[{self.theme['error']}]Hata: {exc}[/]")
-                return None
-
-        avg_elapsed = sum(r["elapsed"] for r in results) / len(results)
-        avg_prompt = sum(r["prompt_tokens"] for r in results) / len(results)
-        avg_completion = sum(r["completion_tokens"] for r in results) / len(results)
-        avg_total = sum(r["total_tokens"] for r in results) / len(results)
-        avg_tps = sum(r["tps"] for r in results) / len(results)
-
-        return {
-            "model": model_name,
-            "runs": len(results),
-            "avg_elapsed": avg_elapsed,
-            "avg_prompt_tokens": avg_prompt,
-            "avg_completion_tokens": avg_completion,
-            "avg_total_tokens": avg_total,
-            "avg_tps": avg_tps,
-        }
-
     def export_chat(self, format_type: str) -> Optional[Path]:
-        try:
-            save_dir = Path(self.config.save_directory).expanduser()
-            save_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            model_short = self.model.split(":")[0].replace("/", "-")
-            title = self.chat_title or f"Chat with {self.model}"
-            title_slug = title.replace(" ", "_")[:30]
-
-            messages = self.messages
-            if self.config.mask_sensitive:
-                messages = mask_messages(messages, self.config.mask_patterns)
-                title = mask_sensitive_text(title, self.config.mask_patterns)
-
-            content = ""
-            extension = format_type
-
-            if format_type == "json":
-                export_data = {
-                    "title": title,
-                    "model": self.model,
-                    "timestamp": datetime.now().isoformat(),
-                    "messages": messages,
-                    "token_stats": self.token_stats.__dict__,
-                }
-                content = json.dumps(export_data, indent=2, ensure_ascii=False)
-
-            elif format_type == "txt":
-                lines = [
-                    f"Ollama Chat - {self.model}",
-                    f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                ]
-                if title:
-                    lines.append(f"Baslik: {title}")
-                lines.append("=" * 50)
-                lines.append("")
-                for msg in messages:
-                    if msg["role"] == "system":
-                        continue
-                    role = "SEN" if msg["role"] == "user" else model_short.upper()
-                    content_text = msg.get("content", "")
-                    if isinstance(content_text, list):
-                        content_text = "[Gorsel]"
-                    lines.append(f"[{role}]")
-                    lines.append(str(content_text))
-                    lines.append("")
-                content = "\n".join(lines)
-
-            elif format_type == "html":
-                content = self.generate_html_export(messages, title_override=title)
-
-            else:
-                extension = "md"
-                lines = [
-                    f"# {title}",
-                    "",
-                    f"**Model:** {self.model}  ",
-                    f"**Tarih:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                    "",
-                    "---",
-                    "",
-                ]
-                for msg in messages:
-                    if msg["role"] == "system":
-                        continue
-                    role = (
-                        "🧑 Sen"
-                        if msg["role"] == "user"
-                        else f"🤖 {model_short.upper()}"
-                    )
-                    content_text = msg.get("content", "")
-                    if isinstance(content_text, list):
-                        content_text = "*[Gorsel]*"
-                    lines.append(f"### {role}")
-                    lines.append("")
-                    lines.append(str(content_text))
-                    lines.append("")
-                    lines.append("---")
-                    lines.append("")
-                content = "\n".join(lines)
-
-            if self.config.encrypt_exports:
-                key = get_encryption_key(self.config)
-                if not key:
-                    raise SecurityError("Export sifreleme icin anahtar gerekli")
-                content = encrypt_text(content, key)
-                extension = f"{extension}.enc"
-
-            filepath = save_dir / f"{timestamp}_{title_slug}.{extension}"
-            filepath.write_text(content, encoding="utf-8")
-
-            self.console.print(
-                f"[{self.theme['success']}]✓ Disari aktarildi: {filepath}[/]\n"
-            )
-            return filepath
-        except Exception as exc:
-            self.logger.exception("Disa aktarma hatasi")
-            self.console.print(f"[{self.theme['error']}]Hata: {exc}[/]\n")
-            return None
+        """Delegate to ui_display."""
+        return self.ui_display.export_chat(
+            format_type, self.messages, self.model, self.chat_title
+        )
 
     def generate_html_export(
         self,
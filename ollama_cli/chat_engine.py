@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import io
 import json
 import re
+import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Union
 
 import requests
 from rich.box import ROUNDED
-from rich.console import Console
+from rich.console import Console, Group
 from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
@@ -19,11 +24,29 @@ from rich.syntax import Syntax
 from rich.text import Text
 
 from .models import ConfigModel, TokenStats
-from .utils import estimate_message_tokens, get_model_prompt
+from .utils import (
+    create_http_session,
+    estimate_message_tokens,
+    get_model_prompt,
+    iter_ndjson_lines,
+    json_dumps,
+    json_loads,
+)
 
 if TYPE_CHECKING:
     from logging import Logger
 
+# Live view is re-rendered at most this often...
+LIVE_REFRESH_INTERVAL = 0.15
+# ...and only once this many new characters arrived...
+LIVE_MIN_NEW_CHARS = 40
+# ...unless pending text has waited this long
+LIVE_MAX_DELAY = 0.5
+# Live Markdown previews only parse this many trailing characters
+LIVE_MARKDOWN_LIMIT = 4096
+# Plain-text streaming flushes stdout at most this often, or on newline
+STDOUT_FLUSH_INTERVAL = 0.05
+
 PERSONAS = {
     "developer": {
         "name": "Yazilim Gelistirici",
@@ -85,8 +108,12 @@ PERSONAS = {
     },
 }
 
+# Read-only view handed out by list_personas instead of a fresh copy
+PERSONAS_VIEW = MappingProxyType(PERSONAS)
+
 SUMMARY_PREFIX = "## Konusma Ozeti"
 DEFAULT_SUMMARY_KEEP = 6
+CODE_BLOCK_RE = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
 
 
 class StreamingStats:
@@ -130,6 +157,112 @@ class StreamingStats:
         return self.tokens / elapsed
 
 
+class StreamWriter:
+    """Batch plain-text stream output into periodic stdout writes."""
+
+    def __init__(self, interval: float = STDOUT_FLUSH_INTERVAL) -> None:
+        self.interval = interval
+        self.parts: List[str] = []
+        self.last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        """Queue text for the next flush."""
+        self.parts.append(text)
+
+    def maybe_flush(self, force: bool = False) -> None:
+        """Flush if forced or the flush interval has elapsed."""
+        if force or time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write queued text to stdout."""
+        if self.parts:
+            sys.stdout.write("".join(self.parts))
+            sys.stdout.flush()
+            self.parts.clear()
+        self.last_flush = time.monotonic()
+
+
+@dataclass(frozen=True)
+class TextEvent:
+    """Plain text outside of a fenced code block."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class CodeBlockEvent:
+    """A complete fenced code block."""
+
+    lang: str
+    code: str
+
+
+StreamEvent = Union[TextEvent, CodeBlockEvent]
+
+
+class StreamCodeSplitter:
+    """Split streamed text into text and fenced code block events."""
+
+    def __init__(self) -> None:
+        self.in_code_block = False
+        self._code_parts: List[str] = []
+        self._pending = ""  # trailing backticks that may start a fence
+
+    def feed(self, chunk: str) -> List[StreamEvent]:
+        """Consume a chunk and return the events it completes."""
+        events: List[StreamEvent] = []
+        text = self._pending + chunk
+        if "`" not in text:
+            # Most chunks contain no fence characters at all
+            self._pending = ""
+            if self.in_code_block:
+                self._code_parts.append(text)
+            elif text:
+                events.append(TextEvent(text))
+            return events
+
+        pos = 0
+        while True:
+            idx = text.find("```", pos)
+            if idx == -1:
+                rest = text[pos:]
+                keep = len(rest) - len(rest.rstrip("`"))
+                self._pending = rest[len(rest) - keep :]
+                segment = rest[: len(rest) - keep]
+                if self.in_code_block:
+                    self._code_parts.append(segment)
+                elif segment:
+                    events.append(TextEvent(segment))
+                return events
+
+            if self.in_code_block:
+                self._code_parts.append(text[pos:idx])
+                events.append(self._close_code_block())
+            elif idx > pos:
+                events.append(TextEvent(text[pos:idx]))
+            self.in_code_block = not self.in_code_block
+            pos = idx + 3
+
+    def close(self) -> List[StreamEvent]:
+        """Flush buffered text, including an unterminated code block."""
+        pending, self._pending = self._pending, ""
+        if self.in_code_block:
+            self._code_parts.append(pending)
+            self.in_code_block = False
+            return [self._close_code_block()]
+        return [TextEvent(pending)] if pending else []
+
+    def _close_code_block(self) -> CodeBlockEvent:
+        code = "".join(self._code_parts)
+        self._code_parts = []
+        first, _, rest = code.partition("\n")
+        first = first.strip()
+        if first.isalnum() and len(first) < 15:
+            return CodeBlockEvent(first, rest)
+        return CodeBlockEvent("text", code)
+
+
 class ChatEngine:
     """Handles conversation flow, streaming, and summarization."""
 
@@ -142,6 +275,7 @@ class ChatEngine:
         token_stats: TokenStats,
         get_theme: Callable[[], Dict[str, str]],
         on_autosave: Optional[Callable[[], None]] = None,
+        http: Optional[requests.Session] = None,
     ) -> None:
         self.config = config
         self.console = console
@@ -150,6 +284,7 @@ class ChatEngine:
         self.token_stats = token_stats
         self._get_theme = get_theme
         self._on_autosave = on_autosave
+        self._http = http or create_http_session()
 
         # Conversation state
         self.messages: List[Dict[str, object]] = []
@@ -160,6 +295,19 @@ class ChatEngine:
         self.current_temperature: Optional[float] = None
         self.model: Optional[str] = None
 
+        # id(message) -> (message, content, tokens); entries are only reused
+        # while both the message and its content are the same objects
+        self._token_cache: Dict[int, tuple] = {}
+        # Running total, valid while the list signature still matches
+        self._token_total = 0
+        self._token_total_key: Optional[tuple] = None
+
+        # Background summary prefetch (config.summary_prefetch)
+        self._summary_executor: Optional[ThreadPoolExecutor] = None
+        self._summary_future: Optional[Future] = None
+        self._summary_source: List[tuple] = []
+        self._summary_base: str = ""
+
     @property
     def theme(self) -> Dict[str, str]:
         """Get current theme colors."""
@@ -171,6 +319,7 @@ class ChatEngine:
         apply_profiles_callback: Optional[Callable[[str], None]] = None,
     ) -> List[Dict[str, object]]:
         """Initialize a new conversation with optional model profiles."""
+        self.cancel_summary_prefetch()
         self.summary = ""
         self.model = model_name
 
@@ -202,6 +351,7 @@ class ChatEngine:
 
     def update_system_message(self) -> None:
         """Update or insert the system message in conversation."""
+        self._token_total_key = None
         combined = self.build_system_prompt()
         base_idx = self._find_base_system_index()
 
@@ -217,6 +367,7 @@ class ChatEngine:
 
     def update_summary_message(self) -> None:
         """Update or insert the summary message in conversation."""
+        self._token_total_key = None
         summary_idx = self._find_summary_index()
 
         if not self.summary:
@@ -243,17 +394,19 @@ class ChatEngine:
     def _find_summary_index(self) -> Optional[int]:
         """Find index of summary message in conversation."""
         for idx, msg in enumerate(self.messages):
+            # System and summary messages only live in the leading block
             if msg.get("role") != "system":
-                continue
-            content = msg.get("content", "")
-            if isinstance(content, str) and content.startswith(SUMMARY_PREFIX):
+                return None
+            if self._is_summary_message(msg):
                 return idx
         return None
 
     def _find_base_system_index(self) -> Optional[int]:
         """Find index of base system message (not summary)."""
         for idx, msg in enumerate(self.messages):
-            if msg.get("role") == "system" and not self._is_summary_message(msg):
+            if msg.get("role") != "system":
+                return None
+            if not self._is_summary_message(msg):
                 return idx
         return None
 
@@ -262,19 +415,64 @@ class ChatEngine:
         content = msg.get("content", "")
         return isinstance(content, str) and content.startswith(SUMMARY_PREFIX)
 
-    def estimate_context_tokens(self) -> int:
-        """Estimate total tokens in current conversation."""
-        return sum(estimate_message_tokens(msg) for msg in self.messages)
+    def estimate_context_tokens(self, limit: Optional[int] = None) -> int:
+        """Estimate total tokens, stopping early once ``limit`` is exceeded."""
+        key = self._messages_key()
+        if key == self._token_total_key:
+            return self._token_total
+
+        cache = self._token_cache
+        if len(cache) > 2 * len(self.messages) + 16:
+            # Drop entries for messages that left the conversation
+            live = {id(msg) for msg in self.messages}
+            self._token_cache = cache = {
+                msg_id: entry for msg_id, entry in cache.items() if msg_id in live
+            }
+
+        total = 0
+        for msg in self.messages:
+            total += self._message_tokens(msg)
+            if limit is not None and total > limit:
+                return total
+
+        self._token_total = total
+        self._token_total_key = key
+        return total
+
+    def _message_tokens(self, msg: Dict[str, object]) -> int:
+        """Return the cached token estimate for a message."""
+        content = msg.get("content")
+        entry = self._token_cache.get(id(msg))
+        if entry is None or entry[0] is not msg or entry[1] is not content:
+            entry = (msg, content, estimate_message_tokens(msg))
+            self._token_cache[id(msg)] = entry
+        return entry[2]
+
+    def _messages_key(self) -> tuple:
+        """Cheap signature of the message list for the running token total."""
+        messages = self.messages
+        if not messages:
+            return (id(messages), 0, 0, 0)
+        last = messages[-1]
+        return (id(messages), len(messages), id(last), id(last.get("content")))
+
+    def _append_message(self, msg: Dict[str, object]) -> None:
+        """Append a message, keeping the running token total current."""
+        valid = self._token_total_key == self._messages_key()
+        self.messages.append(msg)
+        if valid:
+            self._token_total += self._message_tokens(msg)
+            self._token_total_key = self._messages_key()
 
     def maybe_summarize(self, force: bool = False) -> bool:
         """Auto-summarize if approaching token limit."""
         if not force and not self.config.context_autosummarize:
             return False
-        if self.config.context_token_budget <= 0:
+        budget = self.config.context_token_budget
+        if budget <= 0:
             return False
 
-        total = self.estimate_context_tokens()
-        if not force and total <= self.config.context_token_budget:
+        if not force and self.estimate_context_tokens(limit=budget) <= budget:
             return False
 
         return self.summarize_messages()
@@ -285,11 +483,18 @@ class ChatEngine:
         if not to_summarize:
             return False
 
-        self.console.print(f"[{self.theme['muted']}]Ozetleniyor...[/]")
-        summary_text = self.request_summary(to_summarize)
+        theme = self.theme
+        self.console.print(f"[{theme['muted']}]Ozetleniyor...[/]")
+        prefetched = self._take_prefetched_summary(to_summarize)
+        if prefetched is not None:
+            summary_text, covered = prefetched
+            # Messages that aged out after the prefetch stay in the context
+            keep = to_summarize[covered:] + keep
+        else:
+            summary_text = self.request_summary(to_summarize)
 
         if not summary_text:
-            self.console.print(f"[{self.theme['error']}]Ozetleme basarisiz[/]\n")
+            self.console.print(f"[{theme['error']}]Ozetleme basarisiz[/]\n")
             return False
 
         self.summary = summary_text
@@ -298,6 +503,65 @@ class ChatEngine:
         self.update_summary_message()
         return True
 
+    def prefetch_summary(self) -> bool:
+        """Start summarizing in the background when the budget is exceeded."""
+        if self._summary_future is not None:
+            return False
+        if not self.config.context_autosummarize:
+            return False
+        budget = self.config.context_token_budget
+        if budget <= 0 or self.estimate_context_tokens(limit=budget) <= budget:
+            return False
+
+        to_summarize, _ = self._split_messages_for_summary()
+        if not to_summarize:
+            return False
+
+        if self._summary_executor is None:
+            self._summary_executor = ThreadPoolExecutor(max_workers=1)
+        self._summary_source = [(msg, msg.get("content")) for msg in to_summarize]
+        self._summary_base = self.summary
+        self._summary_future = self._summary_executor.submit(
+            self.request_summary, to_summarize
+        )
+        return True
+
+    def cancel_summary_prefetch(self) -> None:
+        """Drop a pending prefetch; the history it covered is being replaced."""
+        future, self._summary_future = self._summary_future, None
+        self._summary_source = []
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop background work so a running prefetch cannot delay exit."""
+        self.cancel_summary_prefetch()
+        if self._summary_executor is not None:
+            self._summary_executor.shutdown(wait=False, cancel_futures=True)
+            self._summary_executor = None
+
+    def _take_prefetched_summary(
+        self, to_summarize: List[Dict[str, object]]
+    ) -> Optional[tuple[str, int]]:
+        """Return (summary, covered) if the prefetch still matches the history."""
+        future, self._summary_future = self._summary_future, None
+        if future is None:
+            return None
+
+        source, self._summary_source = self._summary_source, []
+        if self.summary != self._summary_base or len(source) > len(to_summarize):
+            return None
+        for (msg, content), current in zip(source, to_summarize):
+            if msg is not current or current.get("content") is not content:
+                return None
+
+        try:
+            summary_text = future.result()
+        except Exception:
+            self.logger.exception("Arka plan ozetleme basarisiz")
+            return None
+        return (summary_text, len(source)) if summary_text else None
+
     def _split_messages_for_summary(
         self,
     ) -> tuple[List[Dict[str, object]], List[Dict[str, object]]]:
@@ -329,9 +593,9 @@ class ChatEngine:
         }
 
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.config.ollama_host}/api/chat",
-                json=payload,
+                data=json_dumps(payload),
                 timeout=120,
             )
             response.raise_for_status()
@@ -344,38 +608,37 @@ class ChatEngine:
 
     def _build_summary_input(self, messages: List[Dict[str, object]]) -> str:
         """Format messages for summarization request."""
-        lines = []
-
+        buf = io.StringIO()
+        write = buf.write
         if self.summary:
-            lines.append("Onceki ozet:")
-            lines.append(self.summary)
-            lines.append("")
-
-        lines.append("Mesajlar:")
+            write("Onceki ozet:\n")
+            write(self.summary)
+            write("\n\n")
+        write("Mesajlar:\n")
         for msg in messages:
-            role = "Kullanici" if msg.get("role") == "user" else "Asistan"
+            write("Kullanici: " if msg.get("role") == "user" else "Asistan: ")
             content = msg.get("content", "")
-            if isinstance(content, list):
-                content = "[Gorsel]"
-            lines.append(f"{role}: {content}")
-
-        lines.append("")
-        lines.append("Yeni, guncel bir ozet yaz.")
-        return "\n".join(lines)
+            write(content if isinstance(content, str) else "[Gorsel]")
+            write("\n")
+        write("\nYeni, guncel bir ozet yaz.")
+        return buf.getvalue()
 
     def extract_summary(self, messages: List[Dict[str, object]]) -> str:
         """Extract summary text from message list."""
         for msg in messages:
+            if msg.get("role") != "system":
+                break
             if self._is_summary_message(msg):
                 content = msg.get("content", "")
-                if isinstance(content, str):
-                    return content.replace(SUMMARY_PREFIX, "", 1).strip()
+                return content.replace(SUMMARY_PREFIX, "", 1).strip()
         return ""
 
     def _extract_base_system_prompt(self) -> str:
         """Get base system prompt from conversation."""
         for msg in self.messages:
-            if msg.get("role") == "system" and not self._is_summary_message(msg):
+            if msg.get("role") != "system":
+                break
+            if not self._is_summary_message(msg):
                 content = msg.get("content", "")
                 if isinstance(content, str):
                     return content
@@ -413,14 +676,16 @@ class ChatEngine:
             return None
 
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.config.ollama_host}/api/generate",
-                json={
-                    "model": title_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.3},
-                },
+                data=json_dumps(
+                    {
+                        "model": title_model,
+                        "prompt": prompt,
+                        "stream": False,
+                        "options": {"temperature": 0.3},
+                    }
+                ),
                 timeout=15,
             )
             response.raise_for_status()
@@ -442,6 +707,7 @@ class ChatEngine:
     ) -> Optional[str]:
         """Stream chat response from Ollama API."""
         host = self.config.ollama_host
+        theme = self.theme
 
         try:
             request_data = {
@@ -452,22 +718,21 @@ class ChatEngine:
             if temperature is not None:
                 request_data["options"] = {"temperature": temperature}
 
-            response = requests.post(
+            response = self._http.post(
                 f"{host}/api/chat",
-                json=request_data,
+                data=json_dumps(request_data),
                 stream=True,
                 timeout=300,
             )
             response.raise_for_status()
 
-            self.console.print()
             header = Text()
-            header.append("\u25c9 ", style=f"bold {self.theme['assistant']}")
+            header.append("\u25c9 ", style=f"bold {theme['assistant']}")
             header.append(
-                model.split(":")[0].upper(), style=f"bold {self.theme['assistant']}"
+                model.split(":")[0].upper(), style=f"bold {theme['assistant']}"
             )
-            self.console.print(header)
-            self.console.print(Rule(style=self.theme["muted"]))
+            # Single print: one console lock and layout pass for the header
+            self.console.print(Group(Text(""), header, Rule(style=theme["muted"])))
 
             full_response = ""
             start_time = datetime.now()
@@ -487,188 +752,199 @@ class ChatEngine:
             if self.config.show_metrics:
                 elapsed = (datetime.now() - start_time).total_seconds()
                 tps = completion_tokens / elapsed if elapsed > 0 else 0
-                self.console.print(
-                    f"\n[{self.theme['muted']}]\u23f1 {elapsed:.1f}s  \u25c8 {completion_tokens} token  \u26a1 {tps:.1f} t/s[/]"
+                metrics = Text.from_markup(
+                    f"[{theme['muted']}]\u23f1 {elapsed:.1f}s  \u25c8 {completion_tokens} token  \u26a1 {tps:.1f} t/s[/]"
                 )
-
-            self.console.print()
+                self.console.print(Group(Text(""), metrics, Text("")))
+            else:
+                self.console.print()
             return full_response
 
         except KeyboardInterrupt:
-            self.console.print(f"\n[{self.theme['accent']}]\u25fc Iptal[/]\n")
+            self.console.print(f"\n[{theme['accent']}]\u25fc Iptal[/]\n")
             return full_response if full_response else None
         except requests.RequestException as exc:
             self.logger.exception("Chat stream hatasi")
-            self.console.print(f"\n[{self.theme['error']}]Hata: {exc}[/]\n")
+            self.console.print(f"\n[{theme['error']}]Hata: {exc}[/]\n")
             return None
 
-    def _create_stream_display(self, content: str, tps: float):
-        """Create markdown display with optional TPS indicator."""
-        from rich.console import Group
-
-        md = Markdown(content, code_theme="monokai")
+    def _create_stream_display(
+        self,
+        content: str,
+        tps: float,
+        plain: Optional[Text] = None,
+        tps_style: Optional[str] = None,
+    ):
+        """Create markdown (or plain text) display with optional TPS indicator."""
+        if plain is not None:
+            md = plain
+        else:
+            md = Markdown(self._markdown_preview(content), code_theme="monokai")
         if tps > 0 and self.config.show_live_tps:
-            speed_text = Text(f"⚡ {tps:.1f} t/s", style=self.theme["muted"])
+            speed_text = Text(
+                f"⚡ {tps:.1f} t/s", style=tps_style or self.theme["muted"]
+            )
             return Group(md, speed_text)
         return md
 
+    def _markdown_preview(self, content: str) -> str:
+        """Trim long content to a tail that starts on a line boundary."""
+        if len(content) <= LIVE_MARKDOWN_LIMIT:
+            return content
+        cut = len(content) - LIVE_MARKDOWN_LIMIT
+        newline = content.find("\n", cut)
+        start = newline + 1 if newline != -1 else cut
+        tail = content[start:]
+        # Reopen a code block that the cut landed inside of
+        if content.count("```", 0, start) % 2:
+            tail = "```\n" + tail
+        return tail
+
     def _stream_with_markdown(self, response) -> tuple[str, Dict]:
         """Stream response with live markdown rendering and TPS indicator."""
-        full_response = ""
+        chunks: List[str] = []
         data = {}
         last_update = time.monotonic()
+        pending_chars = 0
+        # Markdown is parsed once at the end unless live rendering is enabled
+        plain: Optional[Text] = None if self.config.live_markdown else Text()
+        tps_style = self.theme["muted"]
         stats = StreamingStats()
         stats.start()
 
         with Live(
-            self._create_stream_display("", 0),
+            self._create_stream_display("", 0, plain),
             console=self.console,
-            refresh_per_second=12,
+            auto_refresh=False,
         ) as live:
-            for line in response.iter_lines():
-                if line:
-                    try:
-                        data = json.loads(line)
-                        if "message" in data:
-                            content = data["message"].get("content", "")
-                            full_response += content
-                            stats.add_tokens(1)  # Each chunk is approximately 1 token
-                            now = time.monotonic()
-                            if now - last_update > 0.1 or "\n" in content:
-                                live.update(
-                                    self._create_stream_display(
-                                        full_response, stats.get_tps()
-                                    )
-                                )
-                                last_update = now
-
-                        if data.get("done"):
-                            break
-                    except (json.JSONDecodeError, KeyError):
-                        continue
+            for line in iter_ndjson_lines(response):
+                try:
+                    data = json_loads(line)
+                    message = data.get("message")
+                    if message is not None:
+                        content = message.get("content", "")
+                        chunks.append(content)
+                        if plain is not None:
+                            plain.append(content)
+                        stats.add_tokens(1)  # Each chunk is approximately 1 token
+                        pending_chars += len(content)
+                        now = time.monotonic()
+                        elapsed = now - last_update
+                        if (
+                            pending_chars >= LIVE_MIN_NEW_CHARS
+                            and elapsed > LIVE_REFRESH_INTERVAL
+                        ) or (pending_chars and elapsed > LIVE_MAX_DELAY):
+                            live.update(
+                                self._create_stream_display(
+                                    "" if plain is not None else "".join(chunks),
+                                    stats.get_tps(),
+                                    plain,
+                                    tps_style,
+                                ),
+                                refresh=True,
+                            )
+                            last_update = now
+                            pending_chars = 0
+
+                    if data.get("done"):
+                        break
+                except json.JSONDecodeError:
+                    continue
             # Final update without TPS (show only markdown)
-            live.update(Markdown(full_response, code_theme="monokai"))
+            full_response = "".join(chunks)
+            live.update(Markdown(full_response, code_theme="monokai"), refresh=True)
 
         return full_response, data
 
     def _stream_without_markdown(self, response) -> tuple[str, Dict]:
         """Stream response with code block detection."""
-        full_response = ""
+        chunks: List[str] = []
         data = {}
-        in_code_block = False
-        code_buffer = ""
-        code_lang = ""
+        splitter = StreamCodeSplitter()
+        writer = StreamWriter()
 
-        for line in response.iter_lines():
-            if line:
+        try:
+            for line in iter_ndjson_lines(response):
                 try:
-                    data = json.loads(line)
-                    if "message" in data:
-                        content = data["message"].get("content", "")
-                        full_response += content
-
-                        for char in content:
-                            if not in_code_block and full_response.endswith("```"):
-                                in_code_block = True
-                                code_buffer = ""
-                                continue
-
-                            if in_code_block:
-                                code_buffer += char
-                                if code_buffer.endswith("```"):
-                                    in_code_block = False
-                                    code_content = code_buffer[:-3]
-                                    lines = code_content.split("\n", 1)
-                                    if (
-                                        lines[0].strip().isalnum()
-                                        and len(lines[0].strip()) < 15
-                                    ):
-                                        code_lang = lines[0].strip()
-                                        code_content = (
-                                            lines[1] if len(lines) > 1 else ""
-                                        )
-                                    else:
-                                        code_lang = "text"
-                                    self.console.print()
-                                    self.console.print(
-                                        Panel(
-                                            Syntax(
-                                                code_content.strip(),
-                                                code_lang,
-                                                theme="monokai",
-                                                line_numbers=True,
-                                                word_wrap=True,
-                                            ),
-                                            title=f"[dim]{code_lang}[/]"
-                                            if code_lang != "text"
-                                            else None,
-                                            border_style=self.theme["muted"],
-                                            box=ROUNDED,
-                                            padding=(0, 1),
-                                        )
-                                    )
-                                    code_buffer = ""
-                                    code_lang = ""
-                            else:
-                                print(char, end="", flush=True)
+                    data = json_loads(line)
+                    message = data.get("message")
+                    if message is not None:
+                        content = message.get("content", "")
+                        chunks.append(content)
+                        for event in splitter.feed(content):
+                            self._render_stream_event(event, writer)
+                        writer.maybe_flush(
+                            force="\n" in content or splitter.in_code_block
+                        )
 
                     if data.get("done"):
                         break
-                except (json.JSONDecodeError, KeyError):
+                except json.JSONDecodeError:
                     continue
+        finally:
+            for event in splitter.close():
+                self._render_stream_event(event, writer)
+            writer.flush()
 
         print()
-        return full_response, data
+        return "".join(chunks), data
+
+    def _render_stream_event(self, event: StreamEvent, writer: StreamWriter) -> None:
+        """Write text events and print code block events."""
+        if isinstance(event, TextEvent):
+            writer.write(event.text)
+            return
+        writer.flush()
+        self._print_code_block(event.code, event.lang)
+
+    def _print_code_block(self, code_content: str, code_lang: str = "text") -> None:
+        """Print a streamed code block as a syntax-highlighted panel."""
+        self.console.print()
+        self.console.print(self._code_panel(code_content.strip(), code_lang))
+
+    def _code_panel(self, code: str, lang: str) -> Panel:
+        """Build the syntax-highlighted panel used for code blocks."""
+        return Panel(
+            Syntax(
+                code,
+                lang,
+                theme="monokai",
+                line_numbers=True,
+                word_wrap=True,
+            ),
+            title=f"[dim]{lang}[/]" if lang != "text" else None,
+            border_style=self.theme["muted"],
+            box=ROUNDED,
+            padding=(0, 1),
+        )
 
     def render_response(self, text: str) -> None:
         """Render markdown/code blocks in response text."""
         if not text:
             return
 
-        code_pattern = r"```(\w*)\n(.*?)```"
-        parts = []
         last_end = 0
-
-        for match in re.finditer(code_pattern, text, re.DOTALL):
-            if match.start() > last_end:
-                parts.append(("text", text[last_end : match.start()]))
-
-            lang = match.group(1) or "text"
-            code = match.group(2).strip()
-            parts.append(("code", (lang, code)))
+        for match in CODE_BLOCK_RE.finditer(text):
+            self._print_markdown_segment(text[last_end : match.start()])
+            self.console.print(
+                self._code_panel(match.group(2).strip(), match.group(1) or "text")
+            )
             last_end = match.end()
+        self._print_markdown_segment(text[last_end:])
 
-        if last_end < len(text):
-            parts.append(("text", text[last_end:]))
-
-        for part_type, content in parts:
-            if part_type == "text" and content.strip():
-                md = Markdown(content, code_theme="monokai")
-                self.console.print(md)
-            elif part_type == "code":
-                lang, code = content
-                self.console.print(
-                    Panel(
-                        Syntax(
-                            code,
-                            lang,
-                            theme="monokai",
-                            line_numbers=True,
-                            word_wrap=True,
-                        ),
-                        title=f"[dim]{lang}[/]" if lang != "text" else None,
-                        border_style=self.theme["muted"],
-                        box=ROUNDED,
-                        padding=(0, 1),
-                    )
-                )
+    def _print_markdown_segment(self, segment: str) -> None:
+        """Print prose between code blocks, skipping blank segments."""
+        if segment.strip():
+            self.console.print(Markdown(segment, code_theme="monokai"))
 
     def handle_response(self, response: Optional[str]) -> None:
         """Process and store model response."""
         if response:
-            self.messages.append({"role": "assistant", "content": response})
+            self._append_message({"role": "assistant", "content": response})
             if self._on_autosave:
                 self._on_autosave()
+            if self.config.summary_prefetch:
+                self.prefetch_summary()
 
     def send_user_message(
         self, content: str, images: Optional[List[str]] = None
@@ -678,7 +954,7 @@ class ChatEngine:
         if images:
             message["images"] = images
 
-        self.messages.append(message)
+        self._append_message(message)
         self.maybe_summarize()
 
         response = self.chat_stream(self.model, self.messages, self.current_temperature)
@@ -697,6 +973,6 @@ class ChatEngine:
         """Get persona information."""
         return PERSONAS.get(persona_name)
 
-    def list_personas(self) -> Dict:
-        """List all available personas."""
-        return PERSONAS.copy()
+    def list_personas(self) -> Mapping[str, Dict[str, str]]:
+        """List all available personas as a read-only view."""
+        return PERSONAS_VIEW
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import argparse
 
-from .app import ChatApp
 from . import __version__
 
 
@@ -22,5 +21,8 @@ def build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+
+    from .app import ChatApp
+
     app = ChatApp(diagnostic_override=args.diag)
     return app.run()
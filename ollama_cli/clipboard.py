@@ -1,30 +1,108 @@
 from __future__ import annotations
 
+import atexit
+import codecs
 import hashlib
 import io
+import os
+import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, Tuple
 
+try:
+    import pyperclip
+except ImportError:  # pyperclip yoksa sistem araclari kullanilir
+    pyperclip = None
+
+try:
+    import xxhash
+except ImportError:  # xxhash istege bagli
+    xxhash = None
+
+# Bytes compared at each end of an image before hashing; the tail of a PNG
+# holds the CRC of the last IDAT chunk, so pixel changes show up there
+IMAGE_EDGE_BYTES = 32
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Copied files Pillow can open when the clipboard holds paths, not pixels
+IMAGE_FILE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp")
+# Grabbed images are sent once and discarded, so favour encode speed over size
+PNG_COMPRESS_LEVEL = 1
+# Text larger than this is piped straight to the OS tool instead of pyperclip
+LARGE_COPY_BYTES = 32768
+# Windows clipboard format and GlobalAlloc flag for SetClipboardData
+CF_UNICODETEXT = 13
+GMEM_MOVEABLE = 0x0002
+# Clipboard tools per platform; Linux picks from X11/Wayland by session
+_COPY_COMMANDS = {"darwin": [["pbcopy"]], "win32": [["clip"]]}
+_X11_COPY_COMMANDS = [
+    ["xclip", "-selection", "clipboard"],
+    ["xsel", "--clipboard", "--input"],
+]
+_WAYLAND_COPY_COMMANDS = [["wl-copy"]]
+_X11_IMAGE_COMMANDS = [["xclip", "-selection", "clipboard", "-t", "image/png", "-o"]]
+_WAYLAND_IMAGE_COMMANDS = [["wl-paste", "--type", "image/png"]]
+# Image reads only consume stdout; stderr is dropped instead of piped
+_IMAGE_OUTPUT = {"stdout": subprocess.PIPE, "stderr": subprocess.DEVNULL}
+# Clipboard tool commands that last succeeded; tried first on the next call
+_copy_command: Optional[list[str]] = None
+_paste_image_command: Optional[list[str]] = None
+# Cleared when Pillow reports it cannot read the clipboard on this system
+_pillow_grab_supported = True
+# Set once a copy succeeds; later copies may then run in the background
+_copy_verified = False
+# ((path, mtime_ns, size), png) of the last copied image file, reused by polls
+_path_image: Optional[tuple[tuple[str, int, int], bytes]] = None
+
 
 class ClipboardTracker:
     """Track clipboard changes for monitoring feature."""
 
     def __init__(self) -> None:
-        self._last_hash: Optional[str] = None
+        self._last_hash: Optional[int] = None
         self._last_content: Optional[str] = None
         self._last_type: Optional[str] = None  # "text" | "image"
+        self._last_change_count: Optional[int] = None
+        self._last_image_edges: Optional[Tuple[int, bytes, bytes]] = None
+
+    def _pasteboard_unchanged(self) -> bool:
+        """Use the OS change counter, when available, to skip full reads."""
+        count = _pasteboard_change_count()
+        if count is None:
+            return False
+        if count == self._last_change_count:
+            return True
+        self._last_change_count = count
+        return False
 
-    def _hash(self, content: bytes) -> str:
-        """Generate MD5 hash of content."""
-        return hashlib.md5(content).hexdigest()
+    def _hash(self, content: bytes) -> int:
+        """Fingerprint content with a fast non-cryptographic 64-bit hash."""
+        if xxhash is not None:
+            return xxhash.xxh3_64_intdigest(content)
+        return int.from_bytes(
+            hashlib.blake2b(content, digest_size=8).digest(), "little"
+        )
 
     def check_change(self, logger) -> Optional[Tuple[str, object]]:
         """Check if clipboard has changed. Returns (type, content) if changed."""
         try:
+            if self._pasteboard_unchanged():
+                return None
+
             # First check for image
             img_bytes, _ = get_image_bytes(logger)
             if img_bytes:
+                edges = (
+                    len(img_bytes),
+                    img_bytes[:IMAGE_EDGE_BYTES],
+                    img_bytes[-IMAGE_EDGE_BYTES:],
+                )
+                if edges == self._last_image_edges and self._last_type == "image":
+                    return None
+                self._last_image_edges = edges
                 h = self._hash(img_bytes)
                 if h != self._last_hash:
                     self._last_hash = h
@@ -32,16 +110,16 @@ class ClipboardTracker:
                     return ("image", img_bytes)
 
             # Then check for text
+            if pyperclip is None:
+                return None
             try:
-                import pyperclip
-
                 text = pyperclip.paste()
-            except ImportError:
-                return None
             except Exception:
                 return None
 
             if text:
+                if text == self._last_content and self._last_type == "text":
+                    return None
                 h = self._hash(text.encode("utf-8"))
                 if h != self._last_hash:
                     self._last_hash = h
@@ -61,86 +139,446 @@ class ClipboardTracker:
         self._last_hash = None
         self._last_content = None
         self._last_type = None
+        self._last_change_count = None
+        self._last_image_edges = None
 
 
-def copy_text(text: str, logger) -> bool:
+def _pasteboard_change_count() -> Optional[int]:
+    """Return an OS clipboard change counter, or None when polling is needed.
+
+    macOS exposes NSPasteboard.changeCount; on Wayland a ``wl-paste --watch``
+    process reports each change. Elsewhere the tracker hashes on every poll.
+    """
+    if sys.platform == "darwin":
+        appkit = _appkit()
+        if appkit is None:
+            return None
+        try:
+            return int(appkit.NSPasteboard.generalPasteboard().changeCount())
+        except Exception:
+            return None
+    if sys.platform.startswith("linux"):
+        watch = _wayland_watch()
+        if watch is not None:
+            return watch.change_count()
+    return None
+
+
+@lru_cache(maxsize=1)
+def _appkit():
+    """Import AppKit once on first use; None when pyobjc is not installed."""
     try:
-        import pyperclip
+        import AppKit
+    except ImportError:
+        return None
+    return AppKit
 
-        pyperclip.copy(text)
-        return True
-    except Exception:
-        logger.debug("pyperclip kopyalama basarisiz, fallback deneniyor", exc_info=True)
 
+class _ClipboardWatch:
+    """Count change notifications printed by a clipboard watcher process."""
+
+    def __init__(self, process: subprocess.Popen) -> None:
+        self._process = process
+        self._count = 0
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def _read(self) -> None:
+        for _ in self._process.stdout:
+            self._count += 1
+
+    def change_count(self) -> Optional[int]:
+        """Current change count, or None once the watcher has exited."""
+        if self._process.poll() is not None:
+            return None
+        return self._count
+
+    def stop(self) -> None:
+        if self._process.poll() is None:
+            self._process.terminate()
+
+
+@lru_cache(maxsize=1)
+def _wayland_watch() -> Optional[_ClipboardWatch]:
+    """Start one ``wl-paste --watch`` listener per process on Wayland."""
+    if _session_type() != "wayland":
+        return None
+    executable = _which("wl-paste")
+    if executable is None:
+        return None
     try:
-        if sys.platform.startswith("darwin"):
-            process = subprocess.Popen(["pbcopy"], stdin=subprocess.PIPE)
-            process.communicate(text.encode("utf-8"))
-            return process.returncode == 0
-        if sys.platform.startswith("win"):
-            process = subprocess.Popen(["clip"], stdin=subprocess.PIPE)
-            process.communicate(text.encode("utf-8"))
-            return process.returncode == 0
-
-        if _run_text_command(["xclip", "-selection", "clipboard"], text):
-            return True
-        if _run_text_command(["xsel", "--clipboard", "--input"], text):
+        process = subprocess.Popen(
+            [executable, "--watch", "echo"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    watch = _ClipboardWatch(process)
+    atexit.register(watch.stop)
+    return watch
+
+
+def paste_text() -> Optional[str]:
+    """Read clipboard text with pyperclip; None when it is not installed."""
+    if pyperclip is None:
+        return None
+    return pyperclip.paste()
+
+
+def copy_text(text: str, logger) -> bool:
+    if sys.platform == "darwin" and _copy_via_appkit(text, logger):
+        return True
+
+    encoded = _encode_for_tools(text)
+    large = len(encoded) > LARGE_COPY_BYTES
+
+    if pyperclip is not None and not large:
+        try:
+            pyperclip.copy(text)
             return True
-        if _run_text_command(["wl-copy"], text):
+        except Exception:
+            logger.debug(
+                "pyperclip kopyalama basarisiz, fallback deneniyor", exc_info=True
+            )
+
+    try:
+        if _copy_via_tools(encoded):
             return True
     except Exception:
         logger.exception("Clipboard kopyalama hatasi")
 
+    if pyperclip is not None and large:
+        try:
+            pyperclip.copy(text)
+            return True
+        except Exception:
+            logger.debug("pyperclip kopyalama basarisiz", exc_info=True)
+
     return False
 
 
-def _run_text_command(cmd: list[str], text: str) -> bool:
+def _copy_via_appkit(text: str, logger) -> bool:
+    """Set the macOS pasteboard string in-process when pyobjc is present."""
+    appkit = _appkit()
+    if appkit is None:
+        return False
     try:
-        process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
-        process.communicate(text.encode("utf-8"))
-        return process.returncode == 0
-    except FileNotFoundError:
+        pasteboard = appkit.NSPasteboard.generalPasteboard()
+        pasteboard.clearContents()
+        return bool(pasteboard.setString_forType_(text, appkit.NSPasteboardTypeString))
+    except Exception:
+        logger.debug("NSPasteboard kopyalama basarisiz", exc_info=True)
         return False
 
 
+def copy_text_background(text: str, logger) -> bool:
+    """Copy text off the caller's thread once a copy has worked before.
+
+    The first copy runs synchronously so a missing clipboard backend is still
+    reported; after that the copy is queued and True is returned right away.
+    """
+    global _copy_verified
+    if not _copy_verified:
+        _copy_verified = copy_text(text, logger)
+        return _copy_verified
+
+    future = _copy_executor().submit(copy_text, text, logger)
+    future.add_done_callback(lambda done: _copy_finished(done, logger))
+    return True
+
+
+@lru_cache(maxsize=1)
+def _copy_executor() -> ThreadPoolExecutor:
+    # One worker keeps copies in order; pending copies finish before exit
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="clipboard")
+
+
+def _copy_finished(future, logger) -> None:
+    global _copy_verified
+    if future.exception() is not None or not future.result():
+        _copy_verified = False
+        logger.warning("Arka plan kopyalama basarisiz")
+
+
+def _encode_for_tools(text: str) -> bytes:
+    """Encode text the way the platform copy tool reads its stdin."""
+    if sys.platform.startswith("win"):
+        # clip decodes stdin with the OEM code page unless it sees a UTF-16 BOM
+        return codecs.BOM_UTF16_LE + text.encode("utf-16-le")
+    return text.encode("utf-8")
+
+
+def _copy_via_tools(encoded: bytes) -> bool:
+    """Pipe already-encoded text to the platform clipboard tool."""
+    global _copy_command
+    if sys.platform == "win32":
+        # USER32 takes NUL-terminated UTF-16 without the BOM clip.exe needs
+        text = encoded[len(codecs.BOM_UTF16_LE) :] + b"\x00\x00"
+        if _copy_via_win32(text):
+            return True
+
+    commands = _COPY_COMMANDS.get(sys.platform) or _session_commands(
+        _X11_COPY_COMMANDS, _WAYLAND_COPY_COMMANDS
+    )
+
+    # xclip, xsel and wl-copy fork a child that owns the selection until the
+    # next copy replaces it, so every copy needs a fresh process; the previous
+    # owner exits on its own when it loses the selection
+    for cmd in _cached_first(_copy_command, commands):
+        if _run_text_command(cmd, encoded):
+            _copy_command = cmd
+            return True
+    _copy_command = None
+    return False
+
+
+@lru_cache(maxsize=1)
+def _win32_clipboard_api():
+    """Load the USER32/KERNEL32 clipboard calls once; None off Windows."""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    except (AttributeError, ImportError, OSError):
+        return None
+
+    # Handles are pointer-sized; the default int restype truncates on 64-bit
+    kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalLock.restype = wintypes.LPVOID
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.restype = wintypes.HGLOBAL
+    kernel32.GetConsoleWindow.restype = wintypes.HWND
+    user32.OpenClipboard.argtypes = [wintypes.HWND]
+    user32.OpenClipboard.restype = wintypes.BOOL
+    user32.EmptyClipboard.restype = wintypes.BOOL
+    user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    user32.SetClipboardData.restype = wintypes.HANDLE
+    user32.CloseClipboard.restype = wintypes.BOOL
+    return ctypes, user32, kernel32
+
+
+def _copy_via_win32(data: bytes) -> bool:
+    """Place NUL-terminated UTF-16-LE text on the clipboard without clip.exe."""
+    api = _win32_clipboard_api()
+    if api is None:
+        return False
+    ctypes, user32, kernel32 = api
+    # EmptyClipboard hands ownership to the opening window; with no owner
+    # SetClipboardData fails, so detached processes fall back to clip.exe
+    owner = kernel32.GetConsoleWindow()
+    if not owner:
+        return False
+
+    handle = kernel32.GlobalAlloc(GMEM_MOVEABLE, len(data))
+    if not handle:
+        return False
+    pointer = kernel32.GlobalLock(handle)
+    if not pointer:
+        kernel32.GlobalFree(handle)
+        return False
+    ctypes.memmove(pointer, data, len(data))
+    kernel32.GlobalUnlock(handle)
+
+    if not user32.OpenClipboard(owner):
+        kernel32.GlobalFree(handle)
+        return False
+    try:
+        user32.EmptyClipboard()
+        if not user32.SetClipboardData(CF_UNICODETEXT, handle):
+            kernel32.GlobalFree(handle)
+            return False
+    finally:
+        user32.CloseClipboard()
+    # The clipboard owns the memory once SetClipboardData succeeds
+    return True
+
+
+def _session_commands(
+    x11: list[list[str]], wayland: list[list[str]]
+) -> list[list[str]]:
+    """Order Linux clipboard tools for the running display server."""
+    session = _session_type()
+    if session == "wayland":
+        # XWayland may also set DISPLAY, but the native tool avoids the bridge
+        return wayland + x11
+    if session == "x11":
+        return x11
+    return x11 + wayland
+
+
+def _session_type() -> Optional[str]:
+    """Return "wayland", "x11" or None for the current Linux session."""
+    if os.environ.get("WAYLAND_DISPLAY"):
+        return "wayland"
+    if os.environ.get("DISPLAY"):
+        return "x11"
+    session = os.environ.get("XDG_SESSION_TYPE")
+    return session if session in ("wayland", "x11") else None
+
+
+def _cached_first(
+    cached: Optional[list[str]], commands: list[list[str]]
+) -> list[list[str]]:
+    """Order commands so the last successful one is tried first."""
+    if cached is None or cached not in commands:
+        return commands
+    return [cached] + [cmd for cmd in commands if cmd != cached]
+
+
+@lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """Resolve a clipboard tool on PATH once per process."""
+    return shutil.which(name)
+
+
+def _run_tool(cmd: list[str], **kwargs) -> Optional[subprocess.CompletedProcess]:
+    """Run a clipboard tool if it is installed; None when it is missing."""
+    executable = _which(cmd[0])
+    if executable is None:
+        return None
+    # Our descriptors are non-inheritable (PEP 446), so skip the close sweep
+    return subprocess.run(
+        [executable, *cmd[1:]], check=False, close_fds=False, **kwargs
+    )
+
+
+def _run_text_command(cmd: list[str], data: bytes) -> bool:
+    result = _run_tool(
+        cmd, input=data, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return result is not None and result.returncode == 0
+
+
 def get_image_bytes(logger) -> Tuple[Optional[bytes], Optional[str]]:
-    image_bytes = _grab_image_via_pillow(logger)
-    if image_bytes:
-        return image_bytes, None
+    # Ready-made PNG from the clipboard first; Pillow decodes and re-encodes
+    if sys.platform.startswith("linux"):
+        grabbers = (_grab_image_via_linux_tools,)
+        # On X11 Pillow would rerun the same xclip image/png query; wl-paste
+        # there asks for any image type, which Pillow can convert to PNG
+        if _session_type() != "x11":
+            grabbers += (_grab_image_via_pillow,)
+    elif sys.platform == "darwin":
+        grabbers = (_grab_png_via_appkit, _grab_image_via_pillow)
+    else:
+        grabbers = (_grab_image_via_pillow, _grab_image_via_linux_tools)
 
-    image_bytes = _grab_image_via_linux_tools(logger)
-    if image_bytes:
-        return image_bytes, None
+    for grab in grabbers:
+        image_bytes = grab(logger)
+        if image_bytes:
+            return image_bytes, None
 
     return None, "Panoda resim bulunamadi veya desteklenmiyor"
 
 
-def _grab_image_via_pillow(logger) -> Optional[bytes]:
+def _grab_png_via_appkit(logger) -> Optional[bytes]:
+    """Read PNG data straight from the macOS pasteboard when pyobjc is present."""
+    appkit = _appkit()
+    if appkit is None:
+        return None
     try:
-        from PIL import ImageGrab, Image
+        pasteboard = appkit.NSPasteboard.generalPasteboard()
+        data = pasteboard.dataForType_(appkit.NSPasteboardTypePNG)
+        if data is None:
+            return None
+        png = bytes(data)
+        return png if png.startswith(PNG_SIGNATURE) else None
+    except Exception:
+        logger.debug("NSPasteboard PNG okuma basarisiz", exc_info=True)
+    return None
+
+
+def _is_png_result(result: Optional[subprocess.CompletedProcess]) -> bool:
+    return (
+        result is not None
+        and result.returncode == 0
+        and result.stdout.startswith(PNG_SIGNATURE)
+    )
+
 
+@lru_cache(maxsize=1)
+def _pillow_modules():
+    """Import Pillow once on first use; None when it is not installed."""
+    try:
+        from PIL import Image, ImageGrab
+    except ImportError:
+        return None
+    return ImageGrab, Image
+
+
+def _grab_image_via_pillow(logger) -> Optional[bytes]:
+    global _pillow_grab_supported
+    modules = _pillow_modules()
+    if modules is None or not _pillow_grab_supported:
+        return None
+    ImageGrab, Image = modules
+    try:
         grabbed = ImageGrab.grabclipboard()
+        if isinstance(grabbed, list):
+            return _image_from_paths(grabbed, Image)
         if isinstance(grabbed, Image.Image):
-            with io.BytesIO() as buf:
-                grabbed.save(buf, format="PNG")
-                return buf.getvalue()
+            return _encode_png(grabbed)
+    except NotImplementedError:
+        # Expected on systems without a grab backend; no traceback, no retry
+        _pillow_grab_supported = False
+        logger.debug("Pillow ImageGrab bu sistemde desteklenmiyor")
     except Exception:
         logger.debug("Pillow ImageGrab basarisiz", exc_info=True)
     return None
 
 
+def _encode_png(image) -> bytes:
+    with io.BytesIO() as buf:
+        image.save(
+            buf,
+            format="PNG",
+            compress_level=PNG_COMPRESS_LEVEL,
+            optimize=False,
+        )
+        return buf.getvalue()
+
+
+def _image_from_paths(paths: list[str], Image) -> Optional[bytes]:
+    """PNG bytes of the first copied image file; PNG files are used unchanged."""
+    global _path_image
+    for path in paths:
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix not in IMAGE_FILE_SUFFIXES:
+            continue
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        # Without a change counter the same file is seen on every poll
+        if _path_image is not None and _path_image[0] == key:
+            return _path_image[1]
+        data = None
+        if suffix == ".png":
+            with open(path, "rb") as f:
+                data = f.read()
+            if not data.startswith(PNG_SIGNATURE):
+                data = None
+        if data is None:
+            with Image.open(path) as image:
+                data = _encode_png(image)
+        _path_image = (key, data)
+        return data
+    return None
+
+
 def _grab_image_via_linux_tools(logger) -> Optional[bytes]:
-    commands = [
-        ["xclip", "-selection", "clipboard", "-t", "image/png", "-o"],
-        ["wl-paste", "--type", "image/png"],
-    ]
-    for cmd in commands:
+    global _paste_image_command
+    commands = _session_commands(_X11_IMAGE_COMMANDS, _WAYLAND_IMAGE_COMMANDS)
+    for cmd in _cached_first(_paste_image_command, commands):
         try:
-            result = subprocess.run(cmd, capture_output=True, check=False)
-            if result.returncode == 0 and result.stdout:
+            result = _run_tool(cmd, **_IMAGE_OUTPUT)
+            if _is_png_result(result):
+                _paste_image_command = cmd
                 return result.stdout
-        except FileNotFoundError:
-            continue
         except Exception:
             logger.debug("Clipboard resim okuma basarisiz", exc_info=True)
     return None
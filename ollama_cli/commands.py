@@ -4,18 +4,30 @@ from __future__ import annotations
 
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.formatted_text import HTML
 from rich.box import ROUNDED
+from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Confirm
 from rich.table import Table
 
 from .chat_engine import PERSONAS
-from .clipboard import copy_text
+from .clipboard import copy_text_background, paste_text
 from .media import encode_image, paste_image_from_clipboard
 from .security import SecurityError, generate_key
 from .storage import save_config, save_favorites
@@ -23,11 +35,26 @@ from .utils import estimate_message_tokens, get_model_prompt
 
 if TYPE_CHECKING:
     from .app import ChatApp
+    from .session_store import SessionMeta
 
 CommandHandler = Callable[[str], bool]
+# Returns the words of one argument completion list
+CompletionSource = Callable[[], Iterable[str]]
 
+# Fixed argument completions
+EXPORT_FORMATS = ("html", "json", "txt", "md")
+SESSION_OPTIONS = ("list", "open", "tag", "untag", "rename", "delete")
+SECURITY_OPTIONS = ("mask", "encrypt", "export", "keygen", "key")
+TOGGLE_OPTIONS = ("on", "off")
+BENCH_OPTIONS = ("all",)
+PROMPTS_OPTIONS = ("add", "remove")
 
-@dataclass(frozen=True)
+# /tpl arguments (name="value" or name=value) and {var} placeholders
+TEMPLATE_ARG_RE = re.compile(r'(\w+)="([^"]+)"|(\w+)=([^\s]+)')
+TEMPLATE_VAR_RE = re.compile(r"\{(\w+)\}")
+
+
+@dataclass(frozen=True, slots=True)
 class Command:
     name: str
     aliases: Tuple[str, ...]
@@ -36,23 +63,132 @@ class Command:
     handler: CommandHandler
 
 
+# (name, aliases, description, handler method) for every built-in command
+COMMAND_TABLE: Tuple[Tuple[str, Tuple[str, ...], str, str], ...] = (
+    ("/help", ("/?",), "Yardim", "cmd_help"),
+    ("/quit", ("/q", "/exit"), "Cikis", "cmd_quit"),
+    ("/clear", ("/c",), "Sohbeti temizle", "cmd_clear"),
+    ("/model", ("/m",), "Model degistir", "cmd_model"),
+    ("/info", ("/i",), "Model bilgisi", "cmd_info"),
+    ("/prompt", ("/p",), "Sistem promptu", "cmd_prompt"),
+    ("/history", ("/h",), "Mesaj gecmisi", "cmd_history"),
+    ("/save", ("/s",), "Sohbeti kaydet", "cmd_save"),
+    ("/load", ("/l",), "Sohbet yukle", "cmd_load"),
+    ("/sessions", (), "Kayitli sohbetler", "cmd_sessions"),
+    ("/session", (), "Oturum yonetimi", "cmd_session"),
+    ("/theme", ("/t",), "Tema degistir", "cmd_theme"),
+    ("/default", ("/d",), "Varsayilan model", "cmd_default"),
+    ("/stats", (), "Model durumlari", "cmd_stats"),
+    ("/fav", (), "Favoriler", "cmd_fav"),
+    ("/template", ("/tpl",), "Sablonlar", "cmd_template"),
+    ("/pull", (), "Model indir", "cmd_pull"),
+    ("/delete", (), "Model sil", "cmd_delete"),
+    ("/img", (), "Resim gonder", "cmd_img"),
+    ("/retry", (), "Son yaniti yenile", "cmd_retry"),
+    ("/edit", (), "Son mesaji duzenle", "cmd_edit"),
+    ("/copy", (), "Son yaniti kopyala", "cmd_copy"),
+    ("/search", (), "Mesajlarda ara", "cmd_search"),
+    ("/tokens", (), "Token kullanimi", "cmd_tokens"),
+    ("/context", (), "Context durumu", "cmd_context"),
+    ("/summarize", (), "Konusma ozetle", "cmd_summarize"),
+    ("/quick", (), "Hizli model degistir", "cmd_quick"),
+    ("/title", (), "Baslik ata", "cmd_title"),
+    ("/compare", (), "Modelleri karsilastir", "cmd_compare"),
+    ("/bench", (), "Benchmark calistir", "cmd_bench"),
+    ("/export", (), "Disari aktar", "cmd_export"),
+    ("/paste", (), "Panodan resim", "cmd_paste"),
+    ("/persona", (), "Persona degistir", "cmd_persona"),
+    ("/profile", (), "Profil sec", "cmd_profile"),
+    ("/security", (), "Guvenlik ayarlari", "cmd_security"),
+    ("/continue", (), "Yaniti devam ettir", "cmd_continue"),
+    ("/temp", (), "Sicaklik ayari", "cmd_temp"),
+    ("/diag", (), "Diagnostik mod", "cmd_diag"),
+    ("/markdown", ("/md",), "Markdown gorunumu", "cmd_markdown"),
+    # Yeni özellikler
+    ("/prompts", (), "Prompt kutuphanesi", "cmd_prompts"),
+    ("/yapistir", (), "Panodan metin kullan", "cmd_yapistir"),
+    ("/clipboard", (), "Clipboard izleme", "cmd_clipboard"),
+)
+
+
 class CommandRegistry:
+    __slots__ = ("_commands", "_unique", "_sorted_keys")
+
     def __init__(self) -> None:
         self._commands: Dict[str, Command] = {}
+        self._unique: Dict[str, Command] = {}
+        self._sorted_keys: Optional[List[str]] = None
 
     def register(self, command: Command) -> None:
         for key in (command.name, *command.aliases):
             self._commands[key] = command
+        self._unique[command.name] = command
+        self._sorted_keys = None
+
+    def register_many(self, commands: Iterable[Command]) -> None:
+        commands = tuple(commands)
+        self._commands.update(
+            {key: cmd for cmd in commands for key in (cmd.name, *cmd.aliases)}
+        )
+        self._unique.update({cmd.name: cmd for cmd in commands})
+        self._sorted_keys = None
 
     def get(self, name: str) -> Optional[Command]:
         return self._commands.get(name)
 
     def list_commands(self) -> List[Command]:
-        unique = {cmd.name: cmd for cmd in self._commands.values()}
-        return list(unique.values())
+        return list(self._unique.values())
 
     def command_strings(self) -> List[str]:
-        return sorted(self._commands.keys())
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._commands)
+        return list(self._sorted_keys)
+
+
+def _command_arg(cmd: str) -> str:
+    """Return the text after the command word, whichever alias was typed."""
+    return cmd.partition(" ")[2].strip()
+
+
+@lru_cache(maxsize=1024)
+def _completion(text: str, start_position: int) -> Completion:
+    """Return a shared Completion; prompt_toolkit never mutates them."""
+    return Completion(text, start_position=start_position)
+
+
+class PrefixTrie:
+    """Dict-of-dicts trie listing stored words that start with a prefix."""
+
+    _END = ""
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        self._root: Dict[str, dict] = {}
+        # Sorted insertion keeps every node's children, and so the walk, sorted
+        for word in sorted(words):
+            self.insert(word)
+
+    def insert(self, word: str) -> None:
+        node = self._root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[self._END] = word
+
+    def starting_with(self, prefix: str) -> Iterator[str]:
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+        stack = [iter(node.items())]
+        while stack:
+            for key, child in stack[-1]:
+                if key == self._END:
+                    yield child
+                else:
+                    stack.append(iter(child.items()))
+                    break
+            else:
+                stack.pop()
 
 
 class SmartCompleter(Completer):
@@ -69,94 +205,77 @@ class SmartCompleter(Completer):
         self.favorites = favorites
         self.models = models
         self.profiles = profiles
+        self._command_trie = PrefixTrie(registry.command_strings())
+
+        def favorites_source():
+            return self.favorites.favorites
+
+        def templates_source():
+            return self.favorites.templates
+
+        def models_source():
+            return (model.get("name", "") for model in self.models)
+
+        def toggle_source():
+            return TOGGLE_OPTIONS
+
+        # Argument completion sources keyed by the command token
+        self._arg_sources: Dict[str, Tuple[CompletionSource, ...]] = {
+            "/fav": (favorites_source,),
+            "/tpl": (templates_source,),
+            "/template": (templates_source,),
+            "/pull": (models_source,),
+            "/delete": (models_source,),
+            "/export": (lambda: EXPORT_FORMATS,),
+            "/persona": (lambda: PERSONAS,),
+            "/profile": (lambda: self.profiles,),
+            "/session": (lambda: SESSION_OPTIONS,),
+            "/security": (lambda: SECURITY_OPTIONS,),
+            "/markdown": (toggle_source,),
+            "/md": (toggle_source,),
+            "/bench": (lambda: BENCH_OPTIONS,),
+            "/prompts": (
+                lambda: self.favorites.library_prompts,
+                lambda: PROMPTS_OPTIONS,
+            ),
+            "/clipboard": (toggle_source,),
+        }
+
+    def refresh_models(self, models) -> None:
+        self.models = models
+
+    def refresh_favorites(self, favorites) -> None:
+        self.favorites = favorites
+
+    def refresh_profiles(self, profiles: Dict) -> None:
+        self.profiles = profiles
+
+    @staticmethod
+    def _matches(words: Iterable[str], prefix: str) -> List[str]:
+        """Return the words of a completion source starting with prefix, sorted."""
+        # Sources are small, mutable dicts and completion only runs on Tab
+        return sorted(word for word in words if word.startswith(prefix))
 
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor
-        if text.startswith("/"):
-            for cmd in self.registry.command_strings():
-                if cmd.startswith(text):
-                    yield Completion(cmd, start_position=-len(text))
-
-            if text.startswith("/fav "):
-                prefix = text[5:]
-                for name in self.favorites.favorites.keys():
-                    if name.startswith(prefix):
-                        yield Completion(name, start_position=-len(prefix))
-
-            if text.startswith("/tpl ") or text.startswith("/template "):
-                prefix = text.split(" ", 1)[1] if " " in text else ""
-                for name in self.favorites.templates.keys():
-                    if name.startswith(prefix):
-                        yield Completion(name, start_position=-len(prefix))
-
-            if text.startswith("/pull ") or text.startswith("/delete "):
-                prefix = text.split(" ", 1)[1] if " " in text else ""
-                for model in self.models:
-                    name = model.get("name", "")
-                    if name.startswith(prefix):
-                        yield Completion(name, start_position=-len(prefix))
-
-            if text.startswith("/export "):
-                prefix = text[8:]
-                for fmt in ["html", "json", "txt", "md"]:
-                    if fmt.startswith(prefix):
-                        yield Completion(fmt, start_position=-len(prefix))
-
-            if text.startswith("/persona "):
-                prefix = text[9:]
-                for name in PERSONAS.keys():
-                    if name.startswith(prefix):
-                        yield Completion(name, start_position=-len(prefix))
-
-            if text.startswith("/profile "):
-                prefix = text[9:]
-                for name in self.profiles.keys():
-                    if name.startswith(prefix):
-                        yield Completion(name, start_position=-len(prefix))
-
-            if text.startswith("/session "):
-                prefix = text.split(" ", 1)[1] if " " in text else ""
-                for option in ["list", "open", "tag", "untag", "rename", "delete"]:
-                    if option.startswith(prefix):
-                        yield Completion(option, start_position=-len(prefix))
-
-            if text.startswith("/security "):
-                prefix = text.split(" ", 1)[1] if " " in text else ""
-                for option in ["mask", "encrypt", "export", "keygen", "key"]:
-                    if option.startswith(prefix):
-                        yield Completion(option, start_position=-len(prefix))
-
-            if text.startswith("/markdown ") or text.startswith("/md "):
-                prefix = text.split(" ", 1)[1] if " " in text else ""
-                for option in ["on", "off"]:
-                    if option.startswith(prefix):
-                        yield Completion(option, start_position=-len(prefix))
-
-            if text.startswith("/bench "):
-                prefix = text.split(" ", 1)[1] if " " in text else ""
-                for option in ["all"]:
-                    if option.startswith(prefix):
-                        yield Completion(option, start_position=-len(prefix))
-
-            if text.startswith("/prompts "):
-                prefix = text[9:]
-                for name in self.favorites.library_prompts.keys():
-                    if name.startswith(prefix):
-                        yield Completion(name, start_position=-len(prefix))
-                for option in ["add", "remove"]:
-                    if option.startswith(prefix):
-                        yield Completion(option, start_position=-len(prefix))
-
-            if text.startswith("/clipboard "):
-                prefix = text[11:]
-                for option in ["on", "off"]:
-                    if option.startswith(prefix):
-                        yield Completion(option, start_position=-len(prefix))
+        if not text.startswith("/"):
+            return
+        head, sep, prefix = text.partition(" ")
+        if not sep:
+            for cmd in self._command_trie.starting_with(text):
+                yield _completion(cmd, -len(text))
+            return
+
+        for words in self._arg_sources.get(head, ()):
+            for word in self._matches(words(), prefix):
+                yield _completion(word, -len(prefix))
 
 
 class CommandHandlers:
     """All command handlers for the chat application."""
 
+    __slots__ = ("app",)
+
     def __init__(self, app: ChatApp) -> None:
         self.app = app
 
@@ -186,130 +305,15 @@ class CommandHandlers:
 
     def register_all(self, registry: CommandRegistry) -> None:
         """Register all commands to the registry."""
-        registry.register(Command("/help", ("/?",), "Yardim", None, self.cmd_help))
-        registry.register(
-            Command("/quit", ("/q", "/exit"), "Cikis", None, self.cmd_quit)
-        )
-        registry.register(
-            Command("/clear", ("/c",), "Sohbeti temizle", None, self.cmd_clear)
-        )
-        registry.register(
-            Command("/model", ("/m",), "Model degistir", None, self.cmd_model)
-        )
-        registry.register(
-            Command("/info", ("/i",), "Model bilgisi", None, self.cmd_info)
-        )
-        registry.register(
-            Command("/prompt", ("/p",), "Sistem promptu", None, self.cmd_prompt)
-        )
-        registry.register(
-            Command("/history", ("/h",), "Mesaj gecmisi", None, self.cmd_history)
-        )
-        registry.register(
-            Command("/save", ("/s",), "Sohbeti kaydet", None, self.cmd_save)
-        )
-        registry.register(
-            Command("/load", ("/l",), "Sohbet yukle", None, self.cmd_load)
-        )
-        registry.register(
-            Command("/sessions", tuple(), "Kayitli sohbetler", None, self.cmd_sessions)
-        )
-        registry.register(
-            Command("/session", tuple(), "Oturum yonetimi", None, self.cmd_session)
-        )
-        registry.register(
-            Command("/theme", ("/t",), "Tema degistir", None, self.cmd_theme)
-        )
-        registry.register(
-            Command("/default", ("/d",), "Varsayilan model", None, self.cmd_default)
-        )
-        registry.register(
-            Command("/stats", tuple(), "Model durumlari", None, self.cmd_stats)
-        )
-        registry.register(Command("/fav", tuple(), "Favoriler", None, self.cmd_fav))
-        registry.register(
-            Command("/template", ("/tpl",), "Sablonlar", None, self.cmd_template)
-        )
-        registry.register(Command("/pull", tuple(), "Model indir", None, self.cmd_pull))
-        registry.register(
-            Command("/delete", tuple(), "Model sil", None, self.cmd_delete)
-        )
-        registry.register(Command("/img", tuple(), "Resim gonder", None, self.cmd_img))
-        registry.register(
-            Command("/retry", tuple(), "Son yaniti yenile", None, self.cmd_retry)
-        )
-        registry.register(
-            Command("/edit", tuple(), "Son mesaji duzenle", None, self.cmd_edit)
-        )
-        registry.register(
-            Command("/copy", tuple(), "Son yaniti kopyala", None, self.cmd_copy)
-        )
-        registry.register(
-            Command("/search", tuple(), "Mesajlarda ara", None, self.cmd_search)
-        )
-        registry.register(
-            Command("/tokens", tuple(), "Token kullanimi", None, self.cmd_tokens)
-        )
-        registry.register(
-            Command("/context", tuple(), "Context durumu", None, self.cmd_context)
-        )
-        registry.register(
-            Command("/summarize", tuple(), "Konusma ozetle", None, self.cmd_summarize)
-        )
-        registry.register(
-            Command("/quick", tuple(), "Hizli model degistir", None, self.cmd_quick)
-        )
-        registry.register(
-            Command("/title", tuple(), "Baslik ata", None, self.cmd_title)
-        )
-        registry.register(
-            Command(
-                "/compare", tuple(), "Modelleri karsilastir", None, self.cmd_compare
-            )
-        )
-        registry.register(
-            Command("/bench", tuple(), "Benchmark calistir", None, self.cmd_bench)
-        )
-        registry.register(
-            Command("/export", tuple(), "Disari aktar", None, self.cmd_export)
-        )
-        registry.register(
-            Command("/paste", tuple(), "Panodan resim", None, self.cmd_paste)
-        )
-        registry.register(
-            Command("/persona", tuple(), "Persona degistir", None, self.cmd_persona)
-        )
-        registry.register(
-            Command("/profile", tuple(), "Profil sec", None, self.cmd_profile)
-        )
-        registry.register(
-            Command("/security", tuple(), "Guvenlik ayarlari", None, self.cmd_security)
-        )
-        registry.register(
-            Command("/continue", tuple(), "Yaniti devam ettir", None, self.cmd_continue)
-        )
-        registry.register(
-            Command("/temp", tuple(), "Sicaklik ayari", None, self.cmd_temp)
-        )
-        registry.register(
-            Command("/diag", tuple(), "Diagnostik mod", None, self.cmd_diag)
-        )
-        registry.register(
-            Command("/markdown", ("/md",), "Markdown gorunumu", None, self.cmd_markdown)
-        )
-        # Yeni özellikler
-        registry.register(
-            Command("/prompts", tuple(), "Prompt kutuphanesi", None, self.cmd_prompts)
-        )
-        registry.register(
-            Command(
-                "/yapistir", tuple(), "Panodan metin kullan", None, self.cmd_yapistir
-            )
-        )
-        registry.register(
-            Command("/clipboard", tuple(), "Clipboard izleme", None, self.cmd_clipboard)
+        registry.register_many(
+            Command(name, aliases, description, None, getattr(self, handler))
+            for name, aliases, description, handler in COMMAND_TABLE
         )
 
+    def _make_table(self) -> Table:
+        """Return an empty table in the shared command-output style."""
+        return Table(box=ROUNDED, border_style=self.theme["primary"], padding=(0, 2))
+
     # ─────────────────────────────────────────────────────────────
     # Basic Commands
     # ─────────────────────────────────────────────────────────────
@@ -335,9 +339,7 @@ class CommandHandlers:
     def cmd_model(self, _: str) -> bool:
         self.app.models = self.app.model_manager.get_models()
         self.app.model_manager.models = self.app.models
-        self.session.completer = SmartCompleter(
-            self.app.registry, self.app.favorites, self.app.models, self.config.profiles
-        )
+        self.session.completer = self.app._get_completer()
         self.app.model_manager.set_session(self.session)
         self.app.model = self.app.model_manager.select_model(self.app.models)
         self.app.messages = self.app.chat_engine.init_conversation(self.app.model)
@@ -367,13 +369,13 @@ class CommandHandlers:
         return True
 
     def cmd_history(self, _: str) -> bool:
+        theme = self.theme
+        user_color, assistant_color = theme["user"], theme["assistant"]
         for msg in self.messages:
             if msg["role"] == "system":
                 continue
             content = msg.get("content", "")[:80]
-            role_color = (
-                self.theme["user"] if msg["role"] == "user" else self.theme["assistant"]
-            )
+            role_color = user_color if msg["role"] == "user" else assistant_color
             self.console.print(f"[{role_color}]{msg['role']}:[/] {content}...")
         self.console.print()
         return True
@@ -390,6 +392,28 @@ class CommandHandlers:
         self.app.list_sessions()
         return True
 
+    def _pick_session(
+        self,
+        parts: List[str],
+        sessions: List[SessionMeta],
+        min_parts: int,
+        usage: str,
+    ) -> Optional[SessionMeta]:
+        """Resolve the 1-based session number in parts[2], reporting errors."""
+        error = self.theme["error"]
+        if len(parts) < min_parts:
+            self.console.print(f"[{error}]Kullanim: {usage}[/]\n")
+            return None
+        try:
+            idx = int(parts[2])
+        except ValueError:
+            self.console.print(f"[{error}]Gecersiz numara[/]\n")
+            return None
+        if idx < 1 or idx > len(sessions):
+            self.console.print(f"[{error}]Gecersiz secim[/]\n")
+            return None
+        return sessions[idx - 1]
+
     def cmd_session(self, cmd: str) -> bool:
         parts = cmd.split()
         if len(parts) == 1 or parts[1] == "list":
@@ -403,84 +427,48 @@ class CommandHandlers:
             return True
 
         if action in ["open", "load"]:
-            if len(parts) < 3:
-                self.console.print(
-                    f"[{self.theme['error']}]Kullanim: /session open <no>[/]\n"
-                )
+            meta = self._pick_session(parts, sessions, 3, "/session open <no>")
+            if meta is None:
                 return True
-            try:
-                idx = int(parts[2])
-            except ValueError:
-                self.console.print(f"[{self.theme['error']}]Gecersiz numara[/]\n")
-                return True
-            if idx < 1 or idx > len(sessions):
-                self.console.print(f"[{self.theme['error']}]Gecersiz secim[/]\n")
-                return True
-            self.app._load_session(sessions[idx - 1])
+            self.app._load_session(meta)
             return True
 
         if action == "tag":
-            if len(parts) < 4:
-                self.console.print(
-                    f"[{self.theme['error']}]Kullanim: /session tag <no> <etiket>[/]\n"
-                )
-                return True
-            try:
-                idx = int(parts[2])
-            except ValueError:
-                self.console.print(f"[{self.theme['error']}]Gecersiz numara[/]\n")
-                return True
-            if idx < 1 or idx > len(sessions):
-                self.console.print(f"[{self.theme['error']}]Gecersiz secim[/]\n")
+            meta = self._pick_session(parts, sessions, 4, "/session tag <no> <etiket>")
+            if meta is None:
                 return True
             tag = parts[3]
-            meta = sessions[idx - 1]
-            tags = set(meta.tags)
-            tags.add(tag)
-            self.app.session_store.update_tags(meta.id, list(tags))
-            if self.app.session_id == meta.id:
-                self.app.session_tags = list(tags)
+            if tag not in meta.tags:
+                tags = meta.tags + [tag]
+                self.app.session_store.update_tags(meta.id, tags)
+                if self.app.session_id == meta.id:
+                    self.app.session_tags = tags
             self.console.print(f"[{self.theme['success']}]✓ Etiket eklendi[/]\n")
             return True
 
         if action == "untag":
-            if len(parts) < 4:
-                self.console.print(
-                    f"[{self.theme['error']}]Kullanim: /session untag <no> <etiket>[/]\n"
-                )
+            meta = self._pick_session(
+                parts, sessions, 4, "/session untag <no> <etiket>"
+            )
+            if meta is None:
                 return True
+            tag = parts[3]
+            tags = meta.tags[:]
             try:
-                idx = int(parts[2])
+                tags.remove(tag)
             except ValueError:
-                self.console.print(f"[{self.theme['error']}]Gecersiz numara[/]\n")
-                return True
-            if idx < 1 or idx > len(sessions):
-                self.console.print(f"[{self.theme['error']}]Gecersiz secim[/]\n")
-                return True
-            tag = parts[3]
-            meta = sessions[idx - 1]
-            tags = [t for t in meta.tags if t != tag]
-            self.app.session_store.update_tags(meta.id, tags)
-            if self.app.session_id == meta.id:
-                self.app.session_tags = tags
+                pass
+            else:
+                self.app.session_store.update_tags(meta.id, tags)
+                if self.app.session_id == meta.id:
+                    self.app.session_tags = tags
             self.console.print(f"[{self.theme['success']}]✓ Etiket kaldirildi[/]\n")
             return True
 
         if action == "delete":
-            if len(parts) < 3:
-                self.console.print(
-                    f"[{self.theme['error']}]Kullanim: /session delete <no>[/]\n"
-                )
-                return True
-            try:
-                idx = int(parts[2])
-            except ValueError:
-                self.console.print(f"[{self.theme['error']}]Gecersiz numara[/]\n")
+            meta = self._pick_session(parts, sessions, 3, "/session delete <no>")
+            if meta is None:
                 return True
-            if idx < 1 or idx > len(sessions):
-                self.console.print(f"[{self.theme['error']}]Gecersiz secim[/]\n")
-                return True
-            meta = sessions[idx - 1]
             if not Confirm.ask(f"[{self.theme['error']}]{meta.title} silinsin mi?[/]"):
                 return True
             self.app.session_store.delete_session(meta.id)
@@ -491,21 +479,12 @@ class CommandHandlers:
             return True
 
         if action == "rename":
-            if len(parts) < 4:
-                self.console.print(
-                    f"[{self.theme['error']}]Kullanim: /session rename <no> <baslik>[/]\n"
-                )
-                return True
-            try:
-                idx = int(parts[2])
-            except ValueError:
-                self.console.print(f"[{self.theme['error']}]Gecersiz numara[/]\n")
-                return True
-            if idx < 1 or idx > len(sessions):
-                self.console.print(f"[{self.theme['error']}]Gecersiz secim[/]\n")
+            meta = self._pick_session(
+                parts, sessions, 4, "/session rename <no> <baslik>"
+            )
+            if meta is None:
                 return True
             new_title = " ".join(parts[3:]).strip()
-            meta = sessions[idx - 1]
             self.app.session_store.update_title(meta.id, new_title)
             if self.app.session_id == meta.id:
                 self.app.chat_title = new_title
@@ -565,13 +544,14 @@ class CommandHandlers:
             return True
 
         if cmd_lower.startswith("/fav "):
-            parts = cmd[5:].strip().split(maxsplit=1)
+            parts = _command_arg(cmd).split(maxsplit=1)
             fav_name = parts[0] if parts else ""
 
             if fav_name == "add" and len(parts) > 1:
                 add_parts = parts[1].split(maxsplit=1)
                 if len(add_parts) == 2:
                     self.app.favorites.favorites[add_parts[0]] = add_parts[1]
+                    self.app.refresh_favorite_keys()
                     save_favorites(self.app.favorites, self.app.paths, self.app.logger)
                     self.console.print(
                         f"[{self.theme['success']}]✓ Eklendi: {add_parts[0]}[/]\n"
@@ -597,7 +577,7 @@ class CommandHandlers:
             return True
 
         if cmd_lower.startswith("/tpl ") and cmd_lower != "/tpl":
-            parts = cmd[5:].strip().split(maxsplit=1)
+            parts = _command_arg(cmd).split(maxsplit=1)
             tpl_name = parts[0] if parts else ""
             templates = self.app.favorites.templates
 
@@ -605,24 +585,24 @@ class CommandHandlers:
                 tpl = templates[tpl_name]
                 prompt_template = tpl.prompt
 
+                values: Dict[str, str] = {}
                 if len(parts) > 1:
-                    for match in re.finditer(
-                        r'(\w+)="([^"]+)"|(\w+)=([^\s]+)', parts[1]
-                    ):
+                    for match in TEMPLATE_ARG_RE.finditer(parts[1]):
                         if match.group(1):
-                            prompt_template = prompt_template.replace(
-                                f"{{{match.group(1)}}}", match.group(2)
-                            )
+                            values.setdefault(match.group(1), match.group(2))
                         else:
-                            prompt_template = prompt_template.replace(
-                                f"{{{match.group(3)}}}", match.group(4)
-                            )
+                            values.setdefault(match.group(3), match.group(4))
 
-                for var in re.findall(r"\{(\w+)\}", prompt_template):
-                    val = self.session.prompt(
-                        HTML(f'<style fg="{self.theme["accent"]}">{var}: </style>')
-                    )
-                    prompt_template = prompt_template.replace(f"{{{var}}}", val)
+                def fill(match: re.Match) -> str:
+                    var = match.group(1)
+                    if var not in values:
+                        values[var] = self.session.prompt(
+                            HTML(f'<style fg="{self.theme["accent"]}">{var}: </style>')
+                        )
+                    return values[var]
+
+                # One pass fills given arguments and asks once for the rest
+                prompt_template = TEMPLATE_VAR_RE.sub(fill, prompt_template)
 
                 user_input = prompt_template
                 self.console.print(
@@ -642,28 +622,18 @@ class CommandHandlers:
 
     def cmd_pull(self, cmd: str) -> bool:
         if cmd.lower().startswith("/pull "):
-            model_to_pull = cmd[6:].strip()
+            model_to_pull = _command_arg(cmd)
             if model_to_pull and self.app.model_manager.pull_model(model_to_pull):
                 self.app.models = self.app.model_manager.get_models()
-                self.session.completer = SmartCompleter(
-                    self.app.registry,
-                    self.app.favorites,
-                    self.app.models,
-                    self.config.profiles,
-                )
+                self.session.completer = self.app._get_completer()
         return True
 
     def cmd_delete(self, cmd: str) -> bool:
         if cmd.lower().startswith("/delete "):
-            model_to_delete = cmd[8:].strip()
+            model_to_delete = _command_arg(cmd)
             if model_to_delete and self.app.model_manager.delete_model(model_to_delete):
                 self.app.models = self.app.model_manager.get_models()
-                self.session.completer = SmartCompleter(
-                    self.app.registry,
-                    self.app.favorites,
-                    self.app.models,
-                    self.config.profiles,
-                )
+                self.session.completer = self.app._get_completer()
         return True
 
     # ─────────────────────────────────────────────────────────────
@@ -675,7 +645,7 @@ class CommandHandlers:
             self.console.print(f"[{self.theme['error']}]Vision model sec (/model)[/]\n")
             return True
 
-        img_parts = cmd[5:].strip().split(maxsplit=1)
+        img_parts = _command_arg(cmd).split(maxsplit=1)
         if not img_parts:
             self.console.print(
                 f"[{self.theme['error']}]Kullanim: /img <yol> [soru][/]\n"
@@ -704,7 +674,7 @@ class CommandHandlers:
             self.console.print(f"[{self.theme['error']}]{error}[/]\n")
             return True
 
-        paste_question = cmd[6:].strip() if len(cmd) > 6 else ""
+        paste_question = _command_arg(cmd)
         if not paste_question:
             paste_question = (
                 self.session.prompt(
@@ -779,7 +749,7 @@ class CommandHandlers:
                 last_response = msg.get("content", "")
                 break
         if last_response:
-            if copy_text(last_response, self.app.logger):
+            if copy_text_background(last_response, self.app.logger):
                 self.console.print(
                     f"[{self.theme['success']}]✓ Panoya kopyalandi ({len(last_response)} karakter)[/]\n"
                 )
@@ -790,7 +760,7 @@ class CommandHandlers:
         return True
 
     def cmd_search(self, cmd: str) -> bool:
-        keyword = cmd[8:].strip()
+        keyword = _command_arg(cmd)
         if keyword:
             self.app.ui_display.search_messages(keyword, self.messages)
         else:
@@ -812,7 +782,7 @@ class CommandHandlers:
         summary_tokens = estimate_message_tokens(
             {"content": self.app.chat_engine.summary}
         )
-        table = Table(box=ROUNDED, border_style=self.theme["primary"], padding=(0, 2))
+        table = self._make_table()
         table.add_column("Alan", style=f"bold {self.theme['accent']}")
         table.add_column("Deger", style="bold white", justify="right")
 
@@ -846,9 +816,8 @@ class CommandHandlers:
     # ─────────────────────────────────────────────────────────────
 
     def cmd_quick(self, cmd: str) -> bool:
-        new_model = cmd[7:].strip()
-        available = [m["name"] for m in self.app.models]
-        if new_model in available:
+        new_model = _command_arg(cmd)
+        if new_model in self.app.model_names_set:
             self.app.model = new_model
             self.app.model_manager.apply_model_profiles(self.app.model)
             prompt_info = get_model_prompt(self.app.model, self.app.prompts)
@@ -867,12 +836,12 @@ class CommandHandlers:
                 f"[{self.theme['error']}]Model bulunamadi: {new_model}[/]\n"
             )
             self.console.print(
-                f"[{self.theme['muted']}]Mevcut: {', '.join(available[:5])}...[/]\n"
+                f"[{self.theme['muted']}]Mevcut: {', '.join(self.app.model_names[:5])}...[/]\n"
             )
         return True
 
     def cmd_title(self, cmd: str) -> bool:
-        title_arg = cmd[6:].strip() if len(cmd) > 6 else ""
+        title_arg = _command_arg(cmd)
         if title_arg:
             self.app.chat_title = title_arg
         else:
@@ -897,7 +866,7 @@ class CommandHandlers:
         self.console.print(
             f"[{self.theme['muted']}]Karsilastirilacak modelleri sec (virgulle ayir):[/]"
         )
-        available = [m["name"] for m in self.app.models]
+        available = self.app.model_names
         for i, model in enumerate(available, 1):
             self.console.print(f"  {i}. {model}")
         selection = self.session.prompt(
@@ -923,7 +892,7 @@ class CommandHandlers:
             self.console.print(f"[{self.theme['error']}]Model secili degil[/]\n")
             return True
 
-        arg = cmd[6:].strip() if len(cmd) > 6 else ""
+        arg = _command_arg(cmd)
         run_all = False
         prompt = self.config.benchmark_prompt
 
@@ -937,50 +906,90 @@ class CommandHandlers:
                 prompt = arg
 
         runs = max(1, int(self.config.benchmark_runs))
-        models = [m["name"] for m in self.app.models] if run_all else [self.app.model]
+        models = self.app.model_names if run_all else [self.app.model]
 
-        summary = []
-        for name in models:
-            result = self.app.ui_display.benchmark_model(name, prompt, runs)
-            if result:
-                summary.append(result)
+        benchmark = self.app.ui_display.benchmark_model
+        if self.config.benchmark_concurrent and len(models) > 1:
+            # Models share the server, so this is opt-in like concurrent runs
+            summary = self._bench_concurrent(models, prompt, runs)
+        else:
+            results = [benchmark(name, prompt, runs) for name in models]
+            summary = [result for result in results if result]
+            if summary:
+                self.console.print(self._bench_panel(summary))
 
         if summary:
-            table = Table(
-                box=ROUNDED, border_style=self.theme["primary"], padding=(0, 2)
-            )
-            table.add_column("Model", style="bold white")
-            table.add_column("Run", style=self.theme["muted"], justify="right")
-            table.add_column("Sure (s)", style=self.theme["accent"], justify="right")
-            table.add_column("Prompt", style=self.theme["muted"], justify="right")
-            table.add_column("Completion", style=self.theme["muted"], justify="right")
-            table.add_column("Toplam", style=self.theme["muted"], justify="right")
-            table.add_column("TPS", style=self.theme["success"], justify="right")
-
-            for item in summary:
-                table.add_row(
-                    item["model"],
-                    str(item["runs"]),
-                    f"{item['avg_elapsed']:.2f}",
-                    f"{item['avg_prompt_tokens']:.0f}",
-                    f"{item['avg_completion_tokens']:.0f}",
-                    f"{item['avg_total_tokens']:.0f}",
-                    f"{item['avg_tps']:.2f}",
-                )
+            self.console.print()
+        return True
 
-            self.console.print(
-                Panel(
-                    table,
-                    title="[bold]Benchmark Sonucu[/]",
-                    border_style=self.theme["primary"],
-                )
+    def _bench_concurrent(
+        self, models: List[str], prompt: str, runs: int
+    ) -> List[Dict[str, object]]:
+        """Benchmark models in parallel, growing one live summary panel.
+
+        Each model runs its repetitions serially so that no more than
+        benchmark_workers requests are in flight at once.
+        """
+        self.console.print(
+            f"[{self.theme['muted']}]Benchmark: {len(models)} model (x{runs})[/]"
+        )
+        benchmark = self.app.ui_display.benchmark_model
+        results: List[Optional[Dict[str, object]]] = [None] * len(models)
+        workers = max(1, min(len(models), self.config.benchmark_workers))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            with Live(console=self.console, refresh_per_second=10) as live:
+                futures = {
+                    executor.submit(
+                        benchmark, name, prompt, runs, quiet=True, workers=1
+                    ): index
+                    for index, name in enumerate(models)
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    done = [result for result in results if result]
+                    if done:
+                        live.update(self._bench_panel(done))
+        except BaseException:
+            # Ctrl-C: drop queued models instead of waiting for all of them
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        return [result for result in results if result]
+
+    def _bench_panel(self, summary: List[Dict[str, object]]) -> Panel:
+        table = self._make_table()
+        table.add_column("Model", style="bold white")
+        table.add_column("Run", style=self.theme["muted"], justify="right")
+        table.add_column("Sure (s)", style=self.theme["accent"], justify="right")
+        table.add_column("Prompt", style=self.theme["muted"], justify="right")
+        table.add_column("Completion", style=self.theme["muted"], justify="right")
+        table.add_column("Toplam", style=self.theme["muted"], justify="right")
+        table.add_column("TPS", style=self.theme["success"], justify="right")
+        table.add_column("Batch", style=self.theme["muted"], justify="right")
+        table.add_column("Toplam TPS", style=self.theme["success"], justify="right")
+
+        for item in summary:
+            table.add_row(
+                item["model"],
+                str(item["runs"]),
+                f"{item['avg_elapsed']:.2f}",
+                f"{item['avg_prompt_tokens']:.0f}",
+                f"{item['avg_completion_tokens']:.0f}",
+                f"{item['avg_total_tokens']:.0f}",
+                f"{item['avg_tps']:.2f}",
+                str(item["batch"]),
+                f"{item['throughput_tps']:.2f}",
             )
-            self.console.print()
 
-        return True
+        return Panel(
+            table,
+            title="[bold]Benchmark Sonucu[/]",
+            border_style=self.theme["primary"],
+        )
 
     def cmd_export(self, cmd: str) -> bool:
-        format_arg = cmd[7:].strip().lower() if len(cmd) > 7 else ""
+        format_arg = _command_arg(cmd).lower()
         if format_arg not in ["html", "json", "txt", "md"]:
             self.console.print(
                 f"[{self.theme['muted']}]Formatlar: html, json, txt, md[/]"
@@ -1006,7 +1015,7 @@ class CommandHandlers:
     # ─────────────────────────────────────────────────────────────
 
     def cmd_persona(self, cmd: str) -> bool:
-        persona_arg = cmd[8:].strip().lower() if len(cmd) > 8 else ""
+        persona_arg = _command_arg(cmd).lower()
 
         if not persona_arg:
             self.console.print(f"\n[{self.theme['accent']}]Mevcut Personalar:[/]")
@@ -1072,8 +1081,7 @@ class CommandHandlers:
         save_config(self.config, self.app.paths, self.app.logger)
 
         if profile.model:
-            available = [m["name"] for m in self.app.models]
-            if profile.model in available:
+            if profile.model in self.app.model_names_set:
                 self.app.model = profile.model
                 self.console.print(
                     f"[{self.theme['muted']}]Profil modeli secildi: {self.app.model}[/]"
@@ -1106,9 +1114,7 @@ class CommandHandlers:
                 if self.config.encryption_key or os.environ.get("OLLAMA_CLI_KEY")
                 else "yok"
             )
-            table = Table(
-                box=ROUNDED, border_style=self.theme["primary"], padding=(0, 2)
-            )
+            table = self._make_table()
             table.add_column("Ayar", style=f"bold {self.theme['accent']}")
             table.add_column("Durum", style="bold white")
             table.add_row(
@@ -1220,7 +1226,7 @@ class CommandHandlers:
         return True
 
     def cmd_temp(self, cmd: str) -> bool:
-        temp_arg = cmd[5:].strip() if len(cmd) > 5 else ""
+        temp_arg = _command_arg(cmd)
 
         if not temp_arg:
             current_temp = (
@@ -1261,7 +1267,7 @@ class CommandHandlers:
     def cmd_diag(self, cmd: str) -> bool:
         from .logging_utils import set_log_level
 
-        arg = cmd[5:].strip().lower() if len(cmd) > 5 else ""
+        arg = _command_arg(cmd).lower()
         if not arg:
             status = "acik" if self.config.diagnostic else "kapali"
             self.console.print(f"[{self.theme['muted']}]Diagnostik mod: {status}[/]")
@@ -1428,24 +1434,22 @@ class CommandHandlers:
     def cmd_yapistir(self, cmd: str) -> bool:
         """Panodaki metni prompt olarak kullan."""
         try:
-            import pyperclip
-
-            text = pyperclip.paste()
-        except ImportError:
+            text = paste_text()
+        except Exception as e:
+            self.console.print(f"[{self.theme['error']}]Pano okunamadi: {e}[/]\n")
+            return True
+        if text is None:
             self.console.print(
                 f"[{self.theme['error']}]pyperclip yuklu degil. pip install pyperclip[/]\n"
             )
             return True
-        except Exception as e:
-            self.console.print(f"[{self.theme['error']}]Pano okunamadi: {e}[/]\n")
-            return True
 
         if not text or not text.strip():
             self.console.print(f"[{self.theme['error']}]Panoda metin yok[/]\n")
             return True
 
         # Opsiyonel prefix
-        prefix = cmd[10:].strip() if len(cmd) > 10 else ""
+        prefix = _command_arg(cmd)
         user_input = f"{prefix} {text}".strip() if prefix else text
 
         preview_len = 100
@@ -18,7 +18,7 @@ from rich.table import Table
 
 from .models import ConfigModel, ProfileModel
 from .storage import read_json, write_json
-from .utils import format_size, get_model_prompt, is_vision_model
+from .utils import format_size, get_model_prompt, is_vision_model, json_loads
 
 if TYPE_CHECKING:
     from logging import Logger
@@ -356,10 +356,7 @@ class ModelManager:
                 for line in response.iter_lines():
                     if line:
                         try:
-                            data = line.decode("utf-8")
-                            import json
-
-                            info = json.loads(data)
+                            info = json_loads(line)
                             status = info.get("status", "")
                             completed = info.get("completed", 0)
                             total = info.get("total", 0)
@@ -369,7 +366,7 @@ class ModelManager:
                                 progress.update(task, completed=pct, description=status)
                             else:
                                 progress.update(task, description=status)
-                        except (json.JSONDecodeError, KeyError):
+                        except (ValueError, KeyError):
                             continue
 
             self.console.print(
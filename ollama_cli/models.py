@@ -93,6 +93,7 @@ class ConfigModel(BaseModel):
     context_keep_last: int = 6
     context_autosummarize: bool = True
     summary_model: Optional[str] = None
+    summary_prefetch: bool = False  # Ozeti yanit sonrasi arka planda hazirla
     summary_prompt: str = (
         "Kisa, net ve yapilandirilmis bir ozet yaz. Teknik terimleri koru, "
         "gereksiz detaylari atla. Gerektiginde madde isaretleri kullan."
@@ -107,11 +108,17 @@ class ConfigModel(BaseModel):
     encryption_enabled: bool = False
     encryption_key: Optional[str] = None
     encrypt_exports: bool = False
+    session_format: str = "json"  # "json" | "msgpack" (msgpack paketi gerekli)
     render_markdown: bool = True
+    live_markdown: bool = False  # Streaming sirasinda Markdown'i canli render et
     benchmark_prompt: str = "Yapay zeka nedir? Kisa bir cumleyle acikla."
     benchmark_runs: int = 1
     benchmark_timeout: int = 120
     benchmark_temperature: float = 0.2
+    benchmark_concurrent: bool = (
+        False  # Tekrarlari paralel calistir (throughput olcumu)
+    )
+    benchmark_workers: int = 4  # Paralel benchmark icin en fazla istek sayisi
     # Otomatik başlık ayarları
     auto_title: bool = True  # Otomatik başlık oluşturma
     auto_title_after: int = 2  # Kaç mesajdan sonra başlık oluştur
@@ -119,6 +126,7 @@ class ConfigModel(BaseModel):
     # Clipboard izleme ayarları
     clipboard_monitor: bool = False  # Clipboard izleme (varsayılan kapalı)
     clipboard_notify: bool = True  # Clipboard değişikliğinde bildirim göster
+    clipboard_poll_interval: float = 0.5  # İki kontrol arası en az süre (saniye)
     # Streaming hız göstergesi
     show_live_tps: bool = True  # Streaming sırasında canlı TPS göster
 
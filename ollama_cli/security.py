@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import re
+from functools import lru_cache
 from typing import Iterable
 
 
@@ -9,20 +10,30 @@ class SecurityError(RuntimeError):
     pass
 
 
-def mask_sensitive_text(text: str, patterns: Iterable[str]) -> str:
+@lru_cache(maxsize=32)
+def _compile_patterns(patterns: tuple[str, ...]) -> tuple[re.Pattern[str], ...]:
+    return tuple(re.compile(pattern) for pattern in patterns)
+
+
+def _apply_patterns(text: str, compiled: tuple[re.Pattern[str], ...]) -> str:
     masked = text
-    for pattern in patterns:
-        masked = re.sub(pattern, "[REDACTED]", masked)
+    for regex in compiled:
+        masked = regex.sub("[REDACTED]", masked)
     return masked
 
 
+def mask_sensitive_text(text: str, patterns: Iterable[str]) -> str:
+    return _apply_patterns(text, _compile_patterns(tuple(patterns)))
+
+
 def mask_messages(messages: list[dict], patterns: Iterable[str]) -> list[dict]:
+    compiled = _compile_patterns(tuple(patterns))
     sanitized = []
     for msg in messages:
         new_msg = dict(msg)
         content = msg.get("content", "")
         if isinstance(content, str):
-            new_msg["content"] = mask_sensitive_text(content, patterns)
+            new_msg["content"] = _apply_patterns(content, compiled)
         sanitized.append(new_msg)
     return sanitized
 
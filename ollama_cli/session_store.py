@@ -16,6 +16,22 @@ from .security import (
     mask_messages,
     mask_sensitive_text,
 )
+from .utils import json_dumps, json_loads
+
+try:
+    import msgpack
+except ImportError:  # msgpack istege bagli
+    msgpack = None
+
+DISPLAY_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def format_display_time(timestamp: str) -> str:
+    """Format an ISO timestamp for session listings."""
+    try:
+        return datetime.fromisoformat(timestamp).strftime(DISPLAY_TIME_FORMAT)
+    except ValueError:
+        return timestamp
 
 
 class SessionMeta(BaseModel):
@@ -30,6 +46,7 @@ class SessionMeta(BaseModel):
     encrypted: bool = False
     path: str
     summary_excerpt: str = ""
+    updated_display: str = ""
 
     model_config = ConfigDict(extra="allow")
 
@@ -95,6 +112,7 @@ class SessionStore:
             encrypted=self.config.encryption_enabled,
             path="",
             summary_excerpt=summary[:120],
+            updated_display=format_display_time(now),
         )
 
         index = self._load_index()
@@ -109,21 +127,31 @@ class SessionStore:
             summary=summary,
         )
 
-        payload = json.dumps(data.model_dump(mode="json"), ensure_ascii=False, indent=2)
-        file_path = self._session_file_path(session_id, self.config.encryption_enabled)
+        raw = data.model_dump(mode="json")
+        session_format = self._session_format()
+        file_path = self._session_file_path(
+            session_id, self.config.encryption_enabled, session_format
+        )
 
         if self.config.encryption_enabled:
             key = get_encryption_key(self.config)
             if not key:
                 raise SecurityError("Sifreleme acik ama anahtar yok")
-            payload = encrypt_text(payload, key)
+            payload = encrypt_text(json_dumps(raw).decode("utf-8"), key).encode("utf-8")
+        elif session_format == "msgpack":
+            payload = msgpack.packb(raw, use_bin_type=True)
+        else:
+            payload = json_dumps(raw)
 
         try:
-            file_path.write_text(payload, encoding="utf-8")
+            file_path.write_bytes(payload)
         except Exception:
             self.logger.exception("Session dosyasi yazilamadi: %s", file_path)
             raise
 
+        if existing and existing.get("path") and existing["path"] != file_path.name:
+            self._remove_session_file(self.paths.sessions_dir / existing["path"])
+
         meta.path = file_path.name
         self._upsert_index(index, meta)
         self._save_index(index)
@@ -143,6 +171,13 @@ class SessionStore:
         if not path.exists():
             return None
 
+        if path.suffix == ".msgpack":
+            if msgpack is None:
+                self.logger.error("msgpack session icin msgpack paketi gerekli")
+                return None
+            data = msgpack.unpackb(path.read_bytes(), raw=False)
+            return SessionData.model_validate(data)
+
         raw = path.read_text(encoding="utf-8")
         if meta.get("encrypted") or path.suffix == ".enc":
             key = get_encryption_key(self.config)
@@ -150,7 +185,7 @@ class SessionStore:
                 raise SecurityError("Sifreli session icin anahtar gerekli")
             raw = decrypt_text(raw, key)
 
-        data = json.loads(raw)
+        data = json_loads(raw)
         return SessionData.model_validate(data)
 
     def delete_session(self, session_id: str) -> bool:
@@ -159,12 +194,7 @@ class SessionStore:
         if not meta:
             return False
 
-        path = self.paths.sessions_dir / meta.get("path", "")
-        if path.exists():
-            try:
-                path.unlink()
-            except Exception:
-                self.logger.exception("Session dosyasi silinemedi: %s", path)
+        self._remove_session_file(self.paths.sessions_dir / meta.get("path", ""))
         self._remove_meta(index, session_id)
         self._save_index(index)
         return True
@@ -176,7 +206,7 @@ class SessionStore:
             return False
 
         meta["tags"] = sorted(set(tags))
-        meta["updated_at"] = datetime.utcnow().isoformat()
+        self._touch(meta)
         self._save_index(index)
         return True
 
@@ -187,7 +217,7 @@ class SessionStore:
             return False
 
         meta["title"] = title
-        meta["updated_at"] = datetime.utcnow().isoformat()
+        self._touch(meta)
         self._save_index(index)
         return True
 
@@ -255,6 +285,11 @@ class SessionStore:
         except Exception:
             self.logger.exception("Session index yazilamadi")
 
+    def _touch(self, meta: Dict[str, Any]) -> None:
+        now = datetime.utcnow().isoformat()
+        meta["updated_at"] = now
+        meta["updated_display"] = format_display_time(now)
+
     def _find_meta(
         self, index: Dict[str, Any], session_id: str
     ) -> Optional[Dict[str, Any]]:
@@ -282,6 +317,29 @@ class SessionStore:
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         return f"{timestamp}_{secrets.token_hex(3)}"
 
-    def _session_file_path(self, session_id: str, encrypted: bool) -> Path:
-        suffix = ".json.enc" if encrypted else ".json"
+    def _remove_session_file(self, path: Path) -> None:
+        if path.is_file():
+            try:
+                path.unlink()
+            except Exception:
+                self.logger.exception("Session dosyasi silinemedi: %s", path)
+
+    def _session_format(self) -> str:
+        session_format = self.config.session_format
+        if session_format == "msgpack" and msgpack is None:
+            self.logger.warning(
+                "msgpack kurulu degil, session JSON olarak kaydedilecek"
+            )
+            return "json"
+        return session_format
+
+    def _session_file_path(
+        self, session_id: str, encrypted: bool, session_format: str = "json"
+    ) -> Path:
+        if encrypted:
+            suffix = ".json.enc"
+        elif session_format == "msgpack":
+            suffix = ".msgpack"
+        else:
+            suffix = ".json"
         return self.paths.sessions_dir / f"{session_id}{suffix}"
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import re
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -26,7 +25,7 @@ from .security import (
     mask_sensitive_text,
 )
 from .templates import generate_html_export as _generate_html_template
-from .utils import get_model_prompt
+from .utils import create_http_session, get_model_prompt, json_dumps
 
 if TYPE_CHECKING:
     from logging import Logger
@@ -44,6 +43,7 @@ class UIDisplay:
         prompts: Dict,
         token_stats: TokenStats,
         get_theme: Callable[[], Dict[str, str]],
+        http: Optional[requests.Session] = None,
     ) -> None:
         self.config = config
         self.console = console
@@ -52,6 +52,9 @@ class UIDisplay:
         self.prompts = prompts
         self.token_stats = token_stats
         self._get_theme = get_theme
+        self._http = http or create_http_session()
+        self._save_dir: Optional[Path] = None
+        self._save_dir_source: Optional[str] = None
 
     @property
     def theme(self) -> Dict[str, str]:
@@ -348,14 +351,10 @@ class UIDisplay:
         table.add_column("Rol", style=f"bold {self.theme['accent']}", width=10)
         table.add_column("Icerik", style="white")
 
+        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+        replacement = f"[bold {self.theme['accent']}]\\g<0>[/]"
         for idx, msg in results:
-            content = msg.get("content", "")[:100]
-            highlighted = re.sub(
-                f"({re.escape(keyword)})",
-                f"[bold {self.theme['accent']}]\\1[/]",
-                content,
-                flags=re.IGNORECASE,
-            )
+            highlighted = pattern.sub(replacement, msg.get("content", "")[:100])
             role_color = (
                 self.theme["user"] if msg["role"] == "user" else self.theme["assistant"]
             )
@@ -385,10 +384,10 @@ class UIDisplay:
     ) -> Optional[Path]:
         """Export conversation to multiple formats."""
         try:
-            save_dir = Path(self.config.save_directory).expanduser()
-            save_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            save_dir = self._export_dir()
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            now_human = now.strftime("%Y-%m-%d %H:%M:%S")
             model_short = model.split(":")[0].replace("/", "-")
             title = chat_title or f"Chat with {model}"
             title_slug = title.replace(" ", "_")[:30]
@@ -405,7 +404,7 @@ class UIDisplay:
                 export_data = {
                     "title": title,
                     "model": model,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now.isoformat(),
                     "messages": export_messages,
                     "token_stats": {
                         "prompt_tokens": self.token_stats.prompt_tokens,
@@ -413,12 +412,12 @@ class UIDisplay:
                         "total_tokens": self.token_stats.total_tokens,
                     },
                 }
-                content = json.dumps(export_data, indent=2, ensure_ascii=False)
+                content = json_dumps(export_data, indent=True).decode("utf-8")
 
             elif format_type == "txt":
                 lines = [
                     f"Ollama Chat - {model}",
-                    f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                    f"Tarih: {now_human}",
                 ]
                 if title:
                     lines.append(f"Baslik: {title}")
@@ -445,7 +444,7 @@ class UIDisplay:
                     f"# {title}",
                     "",
                     f"**Model:** {model}  ",
-                    f"**Tarih:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                    f"**Tarih:** {now_human}",
                     "",
                     "---",
                     "",
@@ -485,10 +484,21 @@ class UIDisplay:
             return filepath
 
         except Exception as exc:
+            self._save_dir = None
             self.logger.exception("Disa aktarma hatasi")
             self.console.print(f"[{self.theme['error']}]Hata: {exc}[/]\n")
             return None
 
+    def _export_dir(self) -> Path:
+        """Resolve and create the export directory once per configured path."""
+        source = self.config.save_directory
+        if self._save_dir is None or self._save_dir_source != source:
+            save_dir = Path(source).expanduser()
+            save_dir.mkdir(parents=True, exist_ok=True)
+            self._save_dir = save_dir
+            self._save_dir_source = source
+        return self._save_dir
+
     def generate_html_export(
         self,
         messages: List[Dict],
@@ -542,9 +552,11 @@ class UIDisplay:
                     )
                 msgs.append({"role": "user", "content": question})
 
-                response = requests.post(
+                response = self._http.post(
                     f"{host}/api/chat",
-                    json={"model": model_name, "messages": msgs, "stream": False},
+                    data=json_dumps(
+                        {"model": model_name, "messages": msgs, "stream": False}
+                    ),
                     timeout=120,
                 )
                 data = response.json()
@@ -579,84 +591,89 @@ class UIDisplay:
         prompt: str,
         runs: int,
         save_benchmark: Optional[Callable[[Dict], None]] = None,
+        quiet: bool = False,
+        workers: Optional[int] = None,
     ) -> Optional[Dict[str, object]]:
-        """Time model response with multiple runs."""
-        host = self.config.ollama_host
-        results = []
+        """Time model response with multiple runs; quiet skips the result panel.
 
-        self.console.print(
-            f"[{self.theme['muted']}]Benchmark: {model_name} (x{runs})[/]"
-        )
-
-        for run in range(1, runs + 1):
-            payload = {
-                "model": model_name,
-                "messages": [{"role": "user", "content": prompt}],
-                "stream": False,
-                "options": {"temperature": self.config.benchmark_temperature},
-            }
-            try:
-                start = time.perf_counter()
-                response = requests.post(
-                    f"{host}/api/chat",
-                    json=payload,
-                    timeout=self.config.benchmark_timeout,
-                )
-                response.raise_for_status()
-                data = response.json()
-                elapsed = time.perf_counter() - start
-                prompt_tokens = int(data.get("prompt_eval_count", 0) or 0)
-                completion_tokens = int(data.get("eval_count", 0) or 0)
-                total_tokens = prompt_tokens + completion_tokens
-                tps = completion_tokens / elapsed if elapsed > 0 else 0
-
-                result = {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "model": model_name,
-                    "prompt": prompt,
-                    "run": run,
-                    "elapsed": elapsed,
-                    "prompt_tokens": prompt_tokens,
-                    "completion_tokens": completion_tokens,
-                    "total_tokens": total_tokens,
-                    "tps": tps,
-                    "temperature": self.config.benchmark_temperature,
-                }
-                results.append(result)
+        workers caps concurrent runs (default: benchmark_workers); callers that
+        already run models in parallel pass 1 to stay within the same budget.
+        """
+        results = []
 
-                if save_benchmark:
-                    save_benchmark(result)
+        if not quiet:
+            self.console.print(
+                f"[{self.theme['muted']}]Benchmark: {model_name} (x{runs})[/]"
+            )
 
-            except Exception as exc:
-                self.logger.exception("Benchmark hatasi: %s", model_name)
-                self.console.print(f"[{self.theme['error']}]Hata: {exc}[/]")
-                return None
+        if workers is None:
+            workers = self.config.benchmark_workers
+        batch = 1
+        start = time.perf_counter()
+        try:
+            if self.config.benchmark_concurrent and runs > 1 and workers > 1:
+                workers = min(runs, workers)
+                batch = workers
+                executor = ThreadPoolExecutor(max_workers=workers)
+                try:
+                    futures = [
+                        executor.submit(self._benchmark_run, model_name, prompt, run)
+                        for run in range(1, runs + 1)
+                    ]
+                    for future in as_completed(futures):
+                        result = future.result()
+                        results.append(result)
+                        if save_benchmark:
+                            save_benchmark(result)
+                except BaseException:
+                    # Ctrl-C or a failed run: drop queued runs instead of waiting
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                executor.shutdown()
+                results.sort(key=lambda r: r["run"])
+            else:
+                for run in range(1, runs + 1):
+                    result = self._benchmark_run(model_name, prompt, run)
+                    results.append(result)
+                    if save_benchmark:
+                        save_benchmark(result)
+        except Exception as exc:
+            self.logger.exception("Benchmark hatasi: %s", model_name)
+            self.console.print(f"[{self.theme['error']}]Hata: {exc}[/]")
+            return None
+        wall = time.perf_counter() - start
 
         avg_elapsed = sum(r["elapsed"] for r in results) / len(results)
         avg_prompt = sum(r["prompt_tokens"] for r in results) / len(results)
         avg_completion = sum(r["completion_tokens"] for r in results) / len(results)
         avg_total = sum(r["total_tokens"] for r in results) / len(results)
         avg_tps = sum(r["tps"] for r in results) / len(results)
+        # Batched runs overlap, so aggregate throughput is measured on wall time
+        completion = sum(r["completion_tokens"] for r in results)
+        throughput_tps = completion / wall if wall > 0 else 0
+
+        if not quiet:
+            table = Table(box=ROUNDED, border_style=self.theme["primary"])
+            table.add_column("Metrik", style=f"bold {self.theme['accent']}")
+            table.add_column("Deger", style="bold white", justify="right")
+
+            table.add_row("Model", model_name)
+            table.add_row("Calisma Sayisi", str(runs))
+            table.add_row("Ort. Sure", f"{avg_elapsed:.2f}s")
+            table.add_row("Ort. Token/s", f"{avg_tps:.1f}")
+            if batch > 1:
+                table.add_row("Batch", str(batch))
+                table.add_row("Toplam Token/s", f"{throughput_tps:.1f}")
+            table.add_row("Ort. Toplam Token", f"{avg_total:.0f}")
 
-        # Display results
-        table = Table(box=ROUNDED, border_style=self.theme["primary"])
-        table.add_column("Metrik", style=f"bold {self.theme['accent']}")
-        table.add_column("Deger", style="bold white", justify="right")
-
-        table.add_row("Model", model_name)
-        table.add_row("Calisma Sayisi", str(runs))
-        table.add_row("Ort. Sure", f"{avg_elapsed:.2f}s")
-        table.add_row("Ort. Token/s", f"{avg_tps:.1f}")
-        table.add_row("Ort. Toplam Token", f"{avg_total:.0f}")
-
-        self.console.print(
-            Panel(
-                table,
-                title="[bold]Benchmark Sonucu[/]",
-                border_style=self.theme["success"],
+            self.console.print(
+                Panel(
+                    table,
+                    title="[bold]Benchmark Sonucu[/]",
+                    border_style=self.theme["success"],
+                )
             )
-        )
-        self.console.print()
+            self.console.print()
 
         return {
             "model": model_name,
@@ -666,4 +683,40 @@ class UIDisplay:
             "avg_completion_tokens": avg_completion,
             "avg_total_tokens": avg_total,
             "avg_tps": avg_tps,
+            "batch": batch,
+            "throughput_tps": throughput_tps,
+        }
+
+    def _benchmark_run(self, model_name: str, prompt: str, run: int) -> Dict:
+        """Execute a single benchmark request and return its metrics."""
+        payload = {
+            "model": model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+            "options": {"temperature": self.config.benchmark_temperature},
+        }
+        start = time.perf_counter()
+        response = self._http.post(
+            f"{self.config.ollama_host}/api/chat",
+            data=json_dumps(payload),
+            timeout=self.config.benchmark_timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        elapsed = time.perf_counter() - start
+        prompt_tokens = int(data.get("prompt_eval_count", 0) or 0)
+        completion_tokens = int(data.get("eval_count", 0) or 0)
+        tps = completion_tokens / elapsed if elapsed > 0 else 0
+
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "model": model_name,
+            "prompt": prompt,
+            "run": run,
+            "elapsed": elapsed,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "tps": tps,
+            "temperature": self.config.benchmark_temperature,
         }
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
-from typing import Dict, Any
+import json
+from typing import Any, Dict, Iterator
 
 from .models import DEFAULT_PROMPT
 
+try:
+    import orjson
+except ImportError:  # orjson istege bagli
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson istege bagli, orjson yoksa kullanilir
+    simdjson = None
+
+# Ollama streams with chunked transfer encoding, so iter_content still yields
+# each chunk as it arrives; the size only caps how much one read may return
+NDJSON_CHUNK_SIZE = 65536
+
 
 def format_size(size_bytes: int) -> str:
     gb = size_bytes / (1024**3)
@@ -35,6 +50,60 @@ def get_model_prompt(
     return prompts.get("_default", DEFAULT_PROMPT.model_dump(mode="json"))
 
 
+def create_http_session():
+    """Create a pooled HTTP session for Ollama API calls."""
+    import requests
+
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if indent:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def iter_ndjson_lines(response, chunk_size: int = NDJSON_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield non-empty lines from a streamed NDJSON response."""
+    tail = b""
+    for buf in response.iter_content(chunk_size=chunk_size):
+        if not buf:
+            continue
+        lines = (tail + buf).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            if line and not line.isspace():
+                yield line
+    if tail.strip():
+        yield tail
+
+
+def json_loads(raw: bytes | str) -> Any:
+    """Parse JSON text or bytes, using orjson or pysimdjson when installed.
+
+    Errors are always raised as json.JSONDecodeError so callers can catch a
+    single exception type regardless of the backend.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    if simdjson is not None:
+        try:
+            return simdjson.loads(raw)
+        except ValueError as exc:
+            raise json.JSONDecodeError(str(exc), "", 0) from exc
+    return json.loads(raw)
+
+
 def estimate_tokens(text: str) -> int:
     if not text:
         return 0
@@ -43,8 +112,9 @@ def estimate_tokens(text: str) -> int:
 
 def estimate_message_tokens(message: Dict[str, Any]) -> int:
     content = message.get("content", "")
+    if isinstance(content, str):
+        # Inlined estimate_tokens: text is by far the most common shape
+        return len(content) // 4 or (1 if content else 0)
     if isinstance(content, list):
         return 256
-    if isinstance(content, str):
-        return estimate_tokens(content)
     return 0
@@ -1,9 +1,23 @@
 """Tests for chat_engine module."""
 
+import json
+import threading
+
 import pytest
 from unittest.mock import MagicMock, patch
+from rich.console import Group
+from rich.markdown import Markdown
+from rich.panel import Panel
+from rich.text import Text
 
-from ollama_cli.chat_engine import ChatEngine, PERSONAS, SUMMARY_PREFIX
+from ollama_cli.chat_engine import (
+    ChatEngine,
+    CodeBlockEvent,
+    PERSONAS,
+    SUMMARY_PREFIX,
+    StreamCodeSplitter,
+    TextEvent,
+)
 
 
 class TestChatEngineInit:
@@ -253,6 +267,32 @@ class TestConversationManagement:
 
         assert result == 1
 
+    def test_find_indices_only_scan_leading_system_block(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [
+            {"role": "system", "content": f"{SUMMARY_PREFIX}\nSummary content"},
+            {"role": "user", "content": "Hello"},
+            {"role": "system", "content": "Late system prompt"},
+        ]
+
+        assert engine._find_summary_index() == 0
+        assert engine._find_base_system_index() is None
+
     def test_is_summary_message_true(
         self,
         mock_config,
@@ -490,6 +530,149 @@ class TestSummarization:
         assert "Asistan: Hi there!" in result
         assert "Yeni, guncel bir ozet yaz" in result
 
+    def test_build_summary_input_exact_layout(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.summary = "Eski"
+        messages = [
+            {"role": "user", "content": ["img"]},
+            {"role": "assistant", "content": "Tamam"},
+        ]
+
+        result = engine._build_summary_input(messages)
+
+        assert result == (
+            "Onceki ozet:\nEski\n\nMesajlar:\nKullanici: [Gorsel]\n"
+            "Asistan: Tamam\n\nYeni, guncel bir ozet yaz."
+        )
+
+    def test_prefetched_summary_is_reused(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        mock_config.context_token_budget = 10
+        mock_config.context_keep_last = 2
+        mock_config.summary_prefetch = True
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [
+            {"role": "user", "content": "a" * 40},
+            {"role": "assistant", "content": "b" * 40},
+            {"role": "user", "content": "c" * 40},
+        ]
+
+        with patch.object(engine, "request_summary", return_value="Ozet") as request:
+            engine.handle_response("d" * 40)
+            assert engine._summary_future is not None
+            engine.messages.append({"role": "user", "content": "e"})
+
+            assert engine.summarize_messages() is True
+
+        request.assert_called_once()
+        assert engine.summary == "Ozet"
+        contents = [m["content"] for m in engine.messages if m["role"] != "system"]
+        # The prefetch covered two messages; the one that aged out since is kept
+        assert contents == ["c" * 40, "d" * 40, "e"]
+
+    def test_stale_prefetch_is_discarded(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        mock_config.context_token_budget = 10
+        mock_config.context_keep_last = 1
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [
+            {"role": "user", "content": "a" * 40},
+            {"role": "assistant", "content": "b" * 40},
+        ]
+
+        with patch.object(
+            engine, "request_summary", side_effect=["Eski", "Yeni"]
+        ) as request:
+            assert engine.prefetch_summary() is True
+            engine.messages[0]["content"] = "degisti"
+
+            assert engine.summarize_messages() is True
+
+        assert request.call_count == 2
+        assert engine.summary == "Yeni"
+
+    def test_reset_drops_pending_prefetch(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        mock_config.context_token_budget = 10
+        mock_config.context_keep_last = 1
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [
+            {"role": "user", "content": "a" * 40},
+            {"role": "assistant", "content": "b" * 40},
+        ]
+        release = threading.Event()
+
+        with patch.object(
+            engine, "request_summary", side_effect=lambda _: release.wait(1)
+        ):
+            assert engine.prefetch_summary() is True
+            engine.init_conversation("llama3:latest")
+
+            assert engine._summary_future is None
+            assert engine._summary_source == []
+            engine.shutdown()
+            assert engine._summary_executor is None
+            release.set()
+
+        assert engine.summary == ""
+
 
 class TestPersonaManagement:
     """Tests for persona handling."""
@@ -587,6 +770,9 @@ class TestPersonaManagement:
         assert "developer" in personas
         assert "teacher" in personas
         assert "assistant" in personas
+        assert personas is engine.list_personas()
+        with pytest.raises(TypeError):
+            personas["yeni"] = {}
 
     def test_get_persona_info(
         self,
@@ -691,6 +877,32 @@ class TestResponseHandling:
 
         assert len(autosave_called) == 1
 
+    def test_render_response_prints_segments_in_order(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+
+        engine.render_response("Once\n```python\nprint(1)\n```\n  \n```\nx\n```Sonra")
+
+        printed = [call.args[0] for call in mock_console.print.call_args_list]
+        assert [type(item) for item in printed] == [Markdown, Panel, Panel, Markdown]
+        assert printed[1].title == "[dim]python[/]"
+        assert printed[2].title is None
+        assert printed[3].markup == "Sonra"
+
 
 class TestExtractSummary:
     """Tests for summary extraction."""
@@ -747,3 +959,525 @@ class TestExtractSummary:
         result = engine.extract_summary(messages)
 
         assert result == ""
+
+    def test_extract_summary_only_reads_leading_system_block(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [
+            {"role": "user", "content": "Merhaba"},
+            {"role": "system", "content": f"{SUMMARY_PREFIX}\nGec ozet"},
+            {"role": "system", "content": "Gec sistem"},
+        ]
+
+        assert engine.extract_summary(engine.messages) == ""
+        assert engine._extract_base_system_prompt() == ""
+
+
+class TestStreaming:
+    """Tests for streaming response handling."""
+
+    def test_stream_with_markdown_refreshes_manually(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+        mock_ollama_stream_response,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        response = MagicMock()
+        response.iter_content.return_value = [
+            line + b"\n" for line in mock_ollama_stream_response
+        ]
+
+        with patch("ollama_cli.chat_engine.Live") as mock_live:
+            full_response, data = engine._stream_with_markdown(response)
+
+        assert full_response == "Bu bir test yaniti."
+        assert data["eval_count"] == 100
+        assert mock_live.call_args.kwargs["auto_refresh"] is False
+        live = mock_live.return_value.__enter__.return_value
+        assert live.update.call_args.kwargs["refresh"] is True
+
+    def test_stream_with_markdown_batches_small_chunks(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        lines = [b'{"message": {"content": "0123456789"}, "done": false}'] * 8
+        lines.append(b'{"message": {"content": ""}, "done": true}')
+        response = MagicMock()
+        response.iter_content.return_value = [line + b"\n" for line in lines]
+        clock = iter(i * 0.05 for i in range(1000))
+
+        with (
+            patch("ollama_cli.chat_engine.Live") as mock_live,
+            patch(
+                "ollama_cli.chat_engine.time.monotonic",
+                side_effect=lambda: next(clock),
+            ),
+        ):
+            engine._stream_with_markdown(response)
+
+        live = mock_live.return_value.__enter__.return_value
+        # One update per 40 new characters plus the final render
+        assert live.update.call_count == 3
+
+    def test_stream_with_markdown_previews_tail_of_long_output(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        mock_config.show_live_tps = False
+        mock_config.live_markdown = True
+        big = "```python\n" + "x = 1\n" * 1000
+        lines = [
+            json.dumps({"message": {"content": big}, "done": False}).encode(),
+            b'{"message": {"content": ""}, "done": true}',
+        ]
+        response = MagicMock()
+        response.iter_content.return_value = [line + b"\n" for line in lines]
+        clock = iter(i * 1.0 for i in range(1000))
+
+        with (
+            patch("ollama_cli.chat_engine.Live") as mock_live,
+            patch(
+                "ollama_cli.chat_engine.time.monotonic",
+                side_effect=lambda: next(clock),
+            ),
+        ):
+            engine._stream_with_markdown(response)
+
+        live = mock_live.return_value.__enter__.return_value
+        interim, final = live.update.call_args_list
+        preview = interim.args[0].markup
+        assert preview.startswith("```\nx = 1\n")
+        assert len(preview) <= 4096 + 4
+        assert final.args[0].markup == big
+
+    @pytest.mark.parametrize("live_markdown", [False, True])
+    def test_stream_with_markdown_live_flag(
+        self,
+        live_markdown,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        mock_config.show_live_tps = False
+        mock_config.live_markdown = live_markdown
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        lines = [
+            b'{"message": {"content": "' + b"*" * 50 + b'"}, "done": false}',
+            b'{"message": {"content": ""}, "done": true}',
+        ]
+        response = MagicMock()
+        response.iter_content.return_value = [line + b"\n" for line in lines]
+        clock = iter(i * 1.0 for i in range(1000))
+
+        with (
+            patch("ollama_cli.chat_engine.Live") as mock_live,
+            patch(
+                "ollama_cli.chat_engine.time.monotonic",
+                side_effect=lambda: next(clock),
+            ),
+        ):
+            engine._stream_with_markdown(response)
+
+        live = mock_live.return_value.__enter__.return_value
+        interim, final = live.update.call_args_list
+        expected = Markdown if live_markdown else Text
+        assert isinstance(interim.args[0], expected)
+        assert isinstance(final.args[0], Markdown)
+
+    def test_stream_without_markdown_writes_text(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+        mock_ollama_stream_response,
+        capsys,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        response = MagicMock()
+        response.iter_content.return_value = [
+            line + b"\n" for line in mock_ollama_stream_response
+        ]
+
+        full_response, _ = engine._stream_without_markdown(response)
+
+        assert full_response == "Bu bir test yaniti."
+        assert capsys.readouterr().out == "Bu bir test yaniti.\n"
+
+    def test_stream_skips_blank_and_malformed_lines(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+        capsys,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        response = MagicMock()
+        response.iter_content.return_value = [
+            b'{"message": {"content": "a"}}\n  \n{bozuk\n',
+            b'{"done": false}\n{"message": {"content": "b"}, "done": true}\n',
+        ]
+
+        full_response, data = engine._stream_without_markdown(response)
+
+        assert full_response == "ab"
+        assert data["done"] is True
+        assert capsys.readouterr().out == "ab\n"
+
+    @pytest.mark.parametrize(
+        "chunks",
+        [
+            ["Kod: ", "```py", "thon\nprint(1)\n", "```", " bitti"],
+            ["Kod: `", "``py", "thon\nprint(1)\n", "``", "` bitti"],
+        ],
+    )
+    def test_stream_without_markdown_renders_code_block(
+        self,
+        chunks,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+        capsys,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        lines = [
+            json.dumps({"message": {"content": c}, "done": False}).encode()
+            for c in chunks
+        ]
+        lines.append(b'{"message": {"content": ""}, "done": true}')
+        response = MagicMock()
+        response.iter_content.return_value = [line + b"\n" for line in lines]
+
+        engine._stream_without_markdown(response)
+
+        panels = [
+            call.args[0]
+            for call in mock_console.print.call_args_list
+            if call.args and isinstance(call.args[0], Panel)
+        ]
+        assert len(panels) == 1
+        assert panels[0].renderable.code == "print(1)"
+        assert panels[0].title == "[dim]python[/]"
+        assert capsys.readouterr().out == "Kod:  bitti\n"
+
+    def test_chat_stream_prints_header_and_metrics_once(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+        mock_ollama_stream_response,
+    ):
+        mock_config.render_markdown = False
+        mock_config.show_metrics = True
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        response = MagicMock()
+        response.iter_content.return_value = [
+            line + b"\n" for line in mock_ollama_stream_response
+        ]
+        engine._http = MagicMock()
+        engine._http.post.return_value = response
+
+        result = engine.chat_stream("llama3:8b", [{"role": "user", "content": "x"}])
+
+        assert result == "Bu bir test yaniti."
+        groups = [
+            call.args[0]
+            for call in mock_console.print.call_args_list
+            if call.args and isinstance(call.args[0], Group)
+        ]
+        assert len(groups) == 2
+        assert groups[0].renderables[1].plain == "\u25c9 LLAMA3"
+        assert "100 token" in groups[1].renderables[1].plain
+
+
+class TestStreamCodeSplitter:
+    """Tests for streamed code fence splitting."""
+
+    def test_emits_text_and_code_events(self):
+        splitter = StreamCodeSplitter()
+
+        events = splitter.feed("Kod: ```python\nprint(1)\n``` bitti")
+
+        assert events == [
+            TextEvent("Kod: "),
+            CodeBlockEvent("python", "print(1)\n"),
+            TextEvent(" bitti"),
+        ]
+        assert splitter.close() == []
+
+    def test_fence_split_across_chunks(self):
+        splitter = StreamCodeSplitter()
+        events = []
+        for chunk in ["a`", "``\nx = 1\n`", "`", "`b"]:
+            events.extend(splitter.feed(chunk))
+
+        assert events == [
+            TextEvent("a"),
+            CodeBlockEvent("text", "\nx = 1\n"),
+            TextEvent("b"),
+        ]
+
+    def test_single_character_chunks_match_whole_text(self):
+        text = "Bir `x` ve ``y``:\n```python\nprint('`')\n```\nSon ``"
+
+        def collect(chunks):
+            splitter = StreamCodeSplitter()
+            events = []
+            for chunk in chunks:
+                events.extend(splitter.feed(chunk))
+            events.extend(splitter.close())
+            text_out = "".join(e.text for e in events if isinstance(e, TextEvent))
+            blocks = [e for e in events if isinstance(e, CodeBlockEvent)]
+            return text_out, blocks
+
+        assert collect(list(text)) == collect([text])
+        text_out, blocks = collect(list(text))
+        assert text_out == "Bir `x` ve ``y``:\n\nSon ``"
+        assert blocks == [CodeBlockEvent("python", "print('`')\n")]
+
+    def test_close_flushes_unterminated_block(self):
+        splitter = StreamCodeSplitter()
+
+        assert splitter.feed("```js\nlet a") == []
+        assert splitter.close() == [CodeBlockEvent("js", "let a")]
+        assert splitter.in_code_block is False
+
+
+class TestTokenCache:
+    """Tests for cached token estimation."""
+
+    def test_estimate_tracks_content_changes(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [{"role": "user", "content": "a" * 40}]
+        assert engine.estimate_context_tokens() == 10
+
+        engine.messages[0]["content"] = "a" * 80
+        assert engine.estimate_context_tokens() == 20
+
+        engine.messages.append({"role": "assistant", "content": "b" * 8})
+        assert engine.estimate_context_tokens() == 22
+
+        engine.messages.pop(0)
+        assert engine.estimate_context_tokens() == 2
+
+    def test_running_total_skips_rescan(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [{"role": "user", "content": "a" * 40} for _ in range(3)]
+        assert engine.estimate_context_tokens() == 30
+
+        with patch(
+            "ollama_cli.chat_engine.estimate_message_tokens", return_value=5
+        ) as estimate:
+            engine.handle_response("b" * 20)
+            assert engine.estimate_context_tokens() == 35
+            assert engine.estimate_context_tokens() == 35
+
+        # Only the appended message was estimated
+        assert estimate.call_count == 1
+
+    def test_running_total_invalidated_by_system_update(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [
+            {"role": "system", "content": "s" * 8},
+            {"role": "user", "content": "a" * 40},
+        ]
+        assert engine.estimate_context_tokens() == 12
+
+        engine.base_system_prompt = "s" * 80
+        engine.update_system_message()
+
+        assert engine.estimate_context_tokens() == 30
+
+    def test_estimate_stops_after_limit(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        engine.messages = [{"role": "user", "content": "a" * 40} for _ in range(5)]
+
+        assert engine.estimate_context_tokens(limit=15) == 20
+        assert engine.estimate_context_tokens() == 50
+
+    def test_forced_summary_skips_estimate(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        mock_config.context_token_budget = 10000
+        engine = ChatEngine(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+
+        with patch.object(engine, "estimate_context_tokens") as estimate, patch.object(
+            engine, "summarize_messages", return_value=True
+        ):
+            assert engine.maybe_summarize(force=True) is True
+
+        estimate.assert_not_called()
@@ -0,0 +1,528 @@
+"""Tests for clipboard module."""
+
+import io
+import threading
+from unittest.mock import MagicMock, patch
+
+from ollama_cli import clipboard
+from ollama_cli.clipboard import ClipboardTracker
+
+PNG = clipboard.PNG_SIGNATURE + b"data"
+
+
+class TestClipboardTracker:
+    """Tests for clipboard change tracking."""
+
+    def test_hash_is_stable_int(self):
+        tracker = ClipboardTracker()
+
+        first = tracker._hash(b"hello")
+
+        assert isinstance(first, int)
+        assert first == tracker._hash(b"hello")
+        assert first != tracker._hash(b"hellp")
+
+    def test_hash_falls_back_without_xxhash(self):
+        tracker = ClipboardTracker()
+
+        with patch.object(clipboard, "xxhash", None):
+            value = tracker._hash(b"hello")
+
+        assert isinstance(value, int)
+        assert value < 2**64
+
+    def test_unchanged_image_skips_hash(self, logger):
+        tracker = ClipboardTracker()
+        png = b"\x89PNG" + b"x" * 100 + b"IEND"
+
+        with (
+            patch.object(clipboard, "_pasteboard_change_count", return_value=None),
+            patch.object(clipboard, "get_image_bytes", return_value=(png, None)),
+            patch.object(tracker, "_hash", wraps=tracker._hash) as hasher,
+        ):
+            assert tracker.check_change(logger) == ("image", png)
+            assert tracker.check_change(logger) is None
+
+        assert hasher.call_count == 1
+
+    def test_unchanged_text_skips_hash(self, logger):
+        tracker = ClipboardTracker()
+
+        with (
+            patch.object(clipboard, "_pasteboard_change_count", return_value=None),
+            patch.object(clipboard, "get_image_bytes", return_value=(None, "yok")),
+            patch.object(clipboard.pyperclip, "paste", return_value="merhaba"),
+            patch.object(tracker, "_hash", wraps=tracker._hash) as hasher,
+        ):
+            assert tracker.check_change(logger) == ("text", "merhaba")
+            assert tracker.check_change(logger) is None
+
+        assert hasher.call_count == 1
+
+    def test_text_check_without_pyperclip(self, logger):
+        tracker = ClipboardTracker()
+
+        with (
+            patch.object(clipboard, "_pasteboard_change_count", return_value=None),
+            patch.object(clipboard, "get_image_bytes", return_value=(None, "yok")),
+            patch.object(clipboard, "pyperclip", None),
+        ):
+            assert tracker.check_change(logger) is None
+
+    def test_paste_text_without_pyperclip(self):
+        with patch.object(clipboard, "pyperclip", None):
+            assert clipboard.paste_text() is None
+
+    def test_appkit_import_is_cached(self):
+        clipboard._appkit.cache_clear()
+        try:
+            with patch.dict("sys.modules", {"AppKit": None}):
+                assert clipboard._appkit() is None
+            assert clipboard._appkit.cache_info().misses == 1
+            assert clipboard._appkit() is None
+            assert clipboard._appkit.cache_info().hits == 1
+        finally:
+            clipboard._appkit.cache_clear()
+
+
+class TestPillowGrab:
+    """Tests for Pillow clipboard image capture."""
+
+    def test_image_is_encoded_as_png(self, logger):
+        from PIL import Image
+
+        image = Image.new("RGB", (4, 4), "red")
+
+        with patch("PIL.ImageGrab.grabclipboard", return_value=image):
+            first = clipboard._grab_image_via_pillow(logger)
+            second = clipboard._grab_image_via_pillow(logger)
+
+        assert first == second
+        assert first.startswith(clipboard.PNG_SIGNATURE)
+
+    def test_png_uses_fast_compression(self, logger):
+        from PIL import Image
+
+        image = Image.new("RGB", (4, 4), "red")
+        with (
+            patch("PIL.ImageGrab.grabclipboard", return_value=image),
+            patch.object(Image.Image, "save") as save,
+        ):
+            clipboard._grab_image_via_pillow(logger)
+
+        assert save.call_args.kwargs == {
+            "format": "PNG",
+            "compress_level": clipboard.PNG_COMPRESS_LEVEL,
+            "optimize": False,
+        }
+
+    def test_copied_png_file_is_read_directly(self, logger, tmp_path):
+        from PIL import Image
+
+        path = tmp_path / "ekran.png"
+        Image.new("RGB", (4, 4), "red").save(path)
+
+        with (
+            patch("PIL.ImageGrab.grabclipboard", return_value=[str(path)]),
+            patch.object(Image.Image, "save") as save,
+        ):
+            assert clipboard._grab_image_via_pillow(logger) == path.read_bytes()
+
+        save.assert_not_called()
+
+    def test_copied_jpeg_file_is_converted(self, logger, tmp_path):
+        from PIL import Image
+
+        path = tmp_path / "foto.jpg"
+        Image.new("RGB", (4, 4), "red").save(path)
+
+        with patch(
+            "PIL.ImageGrab.grabclipboard", return_value=["notlar.txt", str(path)]
+        ):
+            assert clipboard._grab_image_via_pillow(logger).startswith(
+                clipboard.PNG_SIGNATURE
+            )
+
+    def test_copied_file_is_cached_until_it_changes(self, logger, tmp_path):
+        from PIL import Image
+
+        path = tmp_path / "foto.jpg"
+        Image.new("RGB", (4, 4), "red").save(path)
+
+        with (
+            patch("PIL.ImageGrab.grabclipboard", return_value=[str(path)]),
+            patch.object(Image, "open", wraps=Image.open) as open_image,
+        ):
+            first = clipboard._grab_image_via_pillow(logger)
+            assert clipboard._grab_image_via_pillow(logger) is first
+            assert open_image.call_count == 1
+
+            Image.new("RGB", (8, 8), "blue").save(path)
+            assert clipboard._grab_image_via_pillow(logger) != first
+            assert open_image.call_count == 2
+
+    def test_unsupported_grab_is_not_retried(self, monkeypatch):
+        monkeypatch.setattr(clipboard, "_pillow_grab_supported", True)
+        logger = MagicMock()
+        with patch(
+            "PIL.ImageGrab.grabclipboard", side_effect=NotImplementedError
+        ) as grab:
+            assert clipboard._grab_image_via_pillow(logger) is None
+            assert clipboard._grab_image_via_pillow(logger) is None
+
+        grab.assert_called_once()
+        logger.debug.assert_called_once_with(
+            "Pillow ImageGrab bu sistemde desteklenmiyor"
+        )
+
+
+class TestClipboardTools:
+    """Tests for command-line clipboard fallbacks."""
+
+    def test_missing_tool_is_not_spawned(self):
+        with (
+            patch.object(clipboard, "_which", return_value=None),
+            patch.object(clipboard.subprocess, "run") as run,
+        ):
+            assert clipboard._run_text_command(["xclip"], b"x") is False
+
+        run.assert_not_called()
+
+    def test_tool_runs_with_resolved_path(self):
+        with (
+            patch.object(clipboard, "_which", return_value="/usr/bin/xclip"),
+            patch.object(clipboard.subprocess, "run") as run,
+        ):
+            run.return_value.returncode = 0
+            assert clipboard._run_text_command(["xclip", "-i"], b"x") is True
+
+        run.assert_called_once_with(
+            ["/usr/bin/xclip", "-i"],
+            check=False,
+            close_fds=False,
+            input=b"x",
+            stdout=clipboard.subprocess.DEVNULL,
+            stderr=clipboard.subprocess.DEVNULL,
+        )
+
+    def test_windows_copy_uses_utf16_with_bom(self, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "win32")
+
+        encoded = clipboard._encode_for_tools("çay")
+
+        assert encoded == b"\xff\xfe" + "çay".encode("utf-16-le")
+
+    def test_posix_copy_uses_utf8(self, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "linux")
+
+        assert clipboard._encode_for_tools("çay") == "çay".encode("utf-8")
+
+    def test_macos_copy_uses_pasteboard(self, logger, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "darwin")
+        appkit = MagicMock()
+        pasteboard = appkit.NSPasteboard.generalPasteboard.return_value
+        pasteboard.setString_forType_.return_value = True
+        monkeypatch.setattr(clipboard, "_appkit", lambda: appkit)
+        run = MagicMock()
+        monkeypatch.setattr(clipboard, "_run_text_command", run)
+
+        assert clipboard.copy_text("merhaba", logger) is True
+
+        pasteboard.setString_forType_.assert_called_once_with(
+            "merhaba", appkit.NSPasteboardTypeString
+        )
+        run.assert_not_called()
+
+    def test_large_text_skips_pyperclip(self, logger):
+        fake = MagicMock()
+        text = "x" * (clipboard.LARGE_COPY_BYTES + 1)
+
+        with (
+            patch.object(clipboard, "pyperclip", fake),
+            patch.object(clipboard, "_run_text_command", return_value=True) as run,
+        ):
+            assert clipboard.copy_text(text, logger) is True
+
+        fake.copy.assert_not_called()
+        assert run.call_args.args[1] == text.encode("utf-8")
+
+    def test_large_text_falls_back_to_pyperclip(self, logger):
+        fake = MagicMock()
+        text = "x" * (clipboard.LARGE_COPY_BYTES + 1)
+
+        with (
+            patch.object(clipboard, "pyperclip", fake),
+            patch.object(clipboard, "_run_text_command", return_value=False),
+        ):
+            assert clipboard.copy_text(text, logger) is True
+
+        fake.copy.assert_called_once_with(text)
+
+    def test_small_text_uses_pyperclip(self, logger):
+        fake = MagicMock()
+
+        with (
+            patch.object(clipboard, "pyperclip", fake),
+            patch.object(clipboard, "_run_text_command") as run,
+        ):
+            assert clipboard.copy_text("kisa", logger) is True
+
+        fake.copy.assert_called_once_with("kisa")
+        run.assert_not_called()
+
+    def test_session_commands_prefer_wayland(self, monkeypatch):
+        monkeypatch.setenv("WAYLAND_DISPLAY", "wayland-0")
+        monkeypatch.setenv("DISPLAY", ":0")
+
+        assert clipboard._session_commands([["xclip"]], [["wl-copy"]]) == [
+            ["wl-copy"],
+            ["xclip"],
+        ]
+
+    def test_session_commands_skip_wayland_on_x11(self, monkeypatch):
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.setenv("DISPLAY", ":0")
+
+        assert clipboard._session_commands([["xclip"]], [["wl-copy"]]) == [["xclip"]]
+
+    def test_platform_copy_table(self, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "darwin")
+        monkeypatch.setattr(clipboard, "_copy_command", None)
+        run = MagicMock(return_value=False)
+        monkeypatch.setattr(clipboard, "_run_text_command", run)
+
+        assert clipboard._copy_via_tools(b"a") is False
+
+        run.assert_called_once_with(["pbcopy"], b"a")
+
+    def test_windows_copy_uses_user32(self, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "win32")
+        ctypes_mod, user32, kernel32 = MagicMock(), MagicMock(), MagicMock()
+        monkeypatch.setattr(
+            clipboard, "_win32_clipboard_api", lambda: (ctypes_mod, user32, kernel32)
+        )
+        run = MagicMock()
+        monkeypatch.setattr(clipboard, "_run_text_command", run)
+
+        assert clipboard._copy_via_tools(clipboard._encode_for_tools("çay")) is True
+
+        data = "çay".encode("utf-16-le") + b"\x00\x00"
+        ctypes_mod.memmove.assert_called_once_with(
+            kernel32.GlobalLock.return_value, data, len(data)
+        )
+        user32.OpenClipboard.assert_called_once_with(
+            kernel32.GetConsoleWindow.return_value
+        )
+        user32.SetClipboardData.assert_called_once_with(
+            clipboard.CF_UNICODETEXT, kernel32.GlobalAlloc.return_value
+        )
+        user32.CloseClipboard.assert_called_once()
+        run.assert_not_called()
+
+    def test_windows_copy_without_console_window_uses_clip(self, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "win32")
+        monkeypatch.setattr(clipboard, "_copy_command", None)
+        ctypes_mod, user32, kernel32 = MagicMock(), MagicMock(), MagicMock()
+        kernel32.GetConsoleWindow.return_value = None
+        monkeypatch.setattr(
+            clipboard, "_win32_clipboard_api", lambda: (ctypes_mod, user32, kernel32)
+        )
+        run = MagicMock(return_value=True)
+        monkeypatch.setattr(clipboard, "_run_text_command", run)
+
+        assert clipboard._copy_via_tools(b"\xff\xfex\x00") is True
+
+        user32.OpenClipboard.assert_not_called()
+        kernel32.GlobalAlloc.assert_not_called()
+        run.assert_called_once_with(["clip"], b"\xff\xfex\x00")
+
+    def test_windows_copy_falls_back_to_clip(self, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "win32")
+        monkeypatch.setattr(clipboard, "_copy_command", None)
+        monkeypatch.setattr(clipboard, "_win32_clipboard_api", lambda: None)
+        run = MagicMock(return_value=True)
+        monkeypatch.setattr(clipboard, "_run_text_command", run)
+
+        assert clipboard._copy_via_tools(b"\xff\xfex\x00") is True
+
+        run.assert_called_once_with(["clip"], b"\xff\xfex\x00")
+
+    def test_session_type_falls_back_to_xdg(self, monkeypatch):
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.delenv("DISPLAY", raising=False)
+        monkeypatch.delenv("XDG_SESSION_TYPE", raising=False)
+        monkeypatch.setenv("XDG_SESSION_TYPE", "wayland")
+
+        assert clipboard._session_type() == "wayland"
+
+        monkeypatch.setenv("XDG_SESSION_TYPE", "tty")
+        assert clipboard._session_type() is None
+
+    def test_successful_copy_tool_is_tried_first(self, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "linux")
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.delenv("DISPLAY", raising=False)
+        monkeypatch.delenv("XDG_SESSION_TYPE", raising=False)
+        monkeypatch.setattr(clipboard, "_copy_command", None)
+        run = MagicMock(side_effect=lambda cmd, data: cmd == ["wl-copy"])
+        monkeypatch.setattr(clipboard, "_run_text_command", run)
+
+        assert clipboard._copy_via_tools(b"a") is True
+        run.reset_mock()
+        assert clipboard._copy_via_tools(b"b") is True
+
+        run.assert_called_once_with(["wl-copy"], b"b")
+
+    def test_successful_image_tool_is_tried_first(self, logger, monkeypatch):
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.delenv("DISPLAY", raising=False)
+        monkeypatch.delenv("XDG_SESSION_TYPE", raising=False)
+        monkeypatch.setattr(clipboard, "_paste_image_command", None)
+        result = MagicMock(returncode=0, stdout=PNG)
+
+        def fake_run(cmd, **kwargs):
+            return result if cmd[0] == "wl-paste" else None
+
+        run = MagicMock(side_effect=fake_run)
+        monkeypatch.setattr(clipboard, "_run_tool", run)
+
+        assert clipboard._grab_image_via_linux_tools(logger) == PNG
+        run.reset_mock()
+        assert clipboard._grab_image_via_linux_tools(logger) == PNG
+
+        assert run.call_count == 1
+        assert run.call_args.args[0][0] == "wl-paste"
+        assert run.call_args.kwargs == {
+            "stdout": clipboard.subprocess.PIPE,
+            "stderr": clipboard.subprocess.DEVNULL,
+        }
+
+    def test_wayland_image_tool_wins_over_xwayland(self, logger, monkeypatch):
+        monkeypatch.setenv("WAYLAND_DISPLAY", "wayland-0")
+        monkeypatch.setenv("DISPLAY", ":0")
+        monkeypatch.setattr(clipboard, "_paste_image_command", None)
+        run = MagicMock(return_value=MagicMock(returncode=0, stdout=PNG))
+        monkeypatch.setattr(clipboard, "_run_tool", run)
+
+        assert clipboard._grab_image_via_linux_tools(logger) == PNG
+
+        assert [call.args[0][0] for call in run.call_args_list] == ["wl-paste"]
+
+    def test_non_png_tool_output_is_ignored(self, logger, monkeypatch):
+        monkeypatch.setenv("DISPLAY", ":0")
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.setattr(clipboard, "_paste_image_command", None)
+        monkeypatch.setattr(
+            clipboard,
+            "_run_tool",
+            lambda cmd, **kwargs: MagicMock(returncode=0, stdout=b"metin"),
+        )
+
+        assert clipboard._grab_image_via_linux_tools(logger) is None
+
+    def test_x11_skips_pillow_after_xclip_miss(self, logger, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "linux")
+        monkeypatch.setenv("DISPLAY", ":0")
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        pillow = MagicMock()
+        monkeypatch.setattr(clipboard, "_grab_image_via_pillow", pillow)
+        monkeypatch.setattr(
+            clipboard, "_grab_image_via_linux_tools", lambda logger: None
+        )
+
+        image, error = clipboard.get_image_bytes(logger)
+
+        assert image is None and error
+        pillow.assert_not_called()
+
+    def test_wayland_falls_back_to_pillow(self, logger, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "linux")
+        monkeypatch.setenv("WAYLAND_DISPLAY", "wayland-0")
+        monkeypatch.setattr(clipboard, "_grab_image_via_pillow", lambda logger: PNG)
+        monkeypatch.setattr(
+            clipboard, "_grab_image_via_linux_tools", lambda logger: None
+        )
+
+        assert clipboard.get_image_bytes(logger) == (PNG, None)
+
+    def test_linux_prefers_raw_png_over_pillow(self, logger, monkeypatch):
+        monkeypatch.setattr(clipboard.sys, "platform", "linux")
+        pillow = MagicMock()
+        monkeypatch.setattr(clipboard, "_grab_image_via_pillow", pillow)
+        monkeypatch.setattr(
+            clipboard, "_grab_image_via_linux_tools", lambda logger: PNG
+        )
+
+        assert clipboard.get_image_bytes(logger) == (PNG, None)
+        pillow.assert_not_called()
+
+    def test_first_background_copy_is_synchronous(self, logger, monkeypatch):
+        monkeypatch.setattr(clipboard, "_copy_verified", False)
+        monkeypatch.setattr(clipboard, "copy_text", lambda text, logger: False)
+        executor = MagicMock()
+        monkeypatch.setattr(clipboard, "_copy_executor", lambda: executor)
+
+        assert clipboard.copy_text_background("a", logger) is False
+
+        executor.submit.assert_not_called()
+        assert clipboard._copy_verified is False
+
+    def test_verified_copy_runs_in_background(self, logger, monkeypatch):
+        monkeypatch.setattr(clipboard, "_copy_verified", False)
+        copied = []
+        done = threading.Event()
+
+        def fake_copy(text, logger):
+            copied.append(text)
+            if len(copied) == 2:
+                done.set()
+            return True
+
+        monkeypatch.setattr(clipboard, "copy_text", fake_copy)
+
+        assert clipboard.copy_text_background("a", logger) is True
+        assert clipboard.copy_text_background("b", logger) is True
+        assert done.wait(5)
+        assert copied == ["a", "b"]
+
+    def test_failed_background_copy_resets_verification(self, logger, monkeypatch):
+        monkeypatch.setattr(clipboard, "_copy_verified", True)
+        future = MagicMock()
+        future.exception.return_value = None
+        future.result.return_value = False
+
+        clipboard._copy_finished(future, logger)
+
+        assert clipboard._copy_verified is False
+
+
+class TestClipboardWatch:
+    """Tests for event-driven clipboard change counting."""
+
+    def test_counts_watcher_lines(self):
+        process = MagicMock()
+        process.stdout = io.BytesIO(b"\n\n\n")
+        process.poll.return_value = None
+
+        watch = clipboard._ClipboardWatch(process)
+        watch._thread.join(timeout=1)
+
+        assert watch.change_count() == 3
+
+    def test_exited_watcher_falls_back_to_polling(self):
+        process = MagicMock()
+        process.stdout = io.BytesIO(b"")
+        process.poll.return_value = 1
+
+        watch = clipboard._ClipboardWatch(process)
+
+        assert watch.change_count() is None
+
+    def test_no_watch_without_wayland(self, monkeypatch):
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.delenv("XDG_SESSION_TYPE", raising=False)
+        clipboard._wayland_watch.cache_clear()
+        try:
+            assert clipboard._wayland_watch() is None
+        finally:
+            clipboard._wayland_watch.cache_clear()
@@ -1,4 +1,24 @@
-from ollama_cli.commands import Command, CommandRegistry
+import io
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from prompt_toolkit.document import Document
+from rich.console import Console
+
+from ollama_cli.commands import (
+    COMMAND_TABLE,
+    Command,
+    CommandHandlers,
+    CommandRegistry,
+    PrefixTrie,
+    SmartCompleter,
+    _command_arg,
+)
+from ollama_cli.models import TokenStats
+from ollama_cli.ui_display import UIDisplay
 
 
 def test_registry_aliases():
@@ -7,3 +27,371 @@ def test_registry_aliases():
 
     assert registry.get("/help") is not None
     assert registry.get("/h") is not None
+
+
+def test_registry_lists_each_command_once():
+    registry = CommandRegistry()
+    registry.register(Command("/help", ("/h", "/?"), "Help", None, lambda _: True))
+    registry.register(Command("/quit", ("/q",), "Quit", None, lambda _: True))
+
+    assert [cmd.name for cmd in registry.list_commands()] == ["/help", "/quit"]
+    assert registry.command_strings() == ["/?", "/h", "/help", "/q", "/quit"]
+
+    registry.register(Command("/clear", (), "Clear", None, lambda _: True))
+    assert "/clear" in registry.command_strings()
+
+
+def test_register_many_resets_sorted_keys():
+    registry = CommandRegistry()
+    registry.register(Command("/quit", ("/q",), "Quit", None, lambda _: True))
+    assert registry.command_strings() == ["/q", "/quit"]
+
+    registry.register_many(
+        [
+            Command("/help", ("/h",), "Help", None, lambda _: True),
+            Command("/clear", (), "Clear", None, lambda _: True),
+        ]
+    )
+
+    assert registry.command_strings() == ["/clear", "/h", "/help", "/q", "/quit"]
+    assert [cmd.name for cmd in registry.list_commands()] == [
+        "/quit",
+        "/help",
+        "/clear",
+    ]
+
+
+def test_command_has_no_instance_dict():
+    command = Command("/help", ("/h",), "Help", None, lambda _: True)
+
+    assert not hasattr(command, "__dict__")
+    assert not hasattr(CommandRegistry(), "__dict__")
+
+
+def test_register_all_binds_table_handlers():
+    handlers = CommandHandlers(MagicMock())
+    registry = CommandRegistry()
+
+    handlers.register_all(registry)
+
+    assert len(registry.list_commands()) == len(COMMAND_TABLE)
+    assert registry.get("/tpl").handler == handlers.cmd_template
+
+
+def _completer(favorites=None, models=None):
+    registry = CommandRegistry()
+    for name, aliases in (("/model", ("/m",)), ("/md", ()), ("/fav", ())):
+        registry.register(Command(name, aliases, "", None, lambda _: True))
+    favs = SimpleNamespace(
+        favorites=favorites if favorites is not None else {},
+        templates={},
+        library_prompts={},
+    )
+    return SmartCompleter(registry, favs, models or [], {})
+
+
+def _complete(completer, text):
+    return [c.text for c in completer.get_completions(Document(text), None)]
+
+
+def test_prefix_trie_lists_sorted_matches():
+    trie = PrefixTrie(["/model", "/m", "/md", "/fav"])
+
+    assert list(trie.starting_with("/m")) == ["/m", "/md", "/model"]
+    assert list(trie.starting_with("/x")) == []
+    assert list(trie.starting_with("")) == ["/fav", "/m", "/md", "/model"]
+
+
+def test_completer_matches_commands_by_prefix():
+    assert _complete(_completer(), "/m") == ["/m", "/md", "/model"]
+
+
+def test_completer_reuses_completion_objects():
+    completer = _completer()
+
+    first = list(completer.get_completions(Document("/mo"), None))
+    second = list(completer.get_completions(Document("/mo"), None))
+
+    assert first[0] is second[0]
+    assert first[0].start_position == -3
+
+
+def test_completer_sees_new_favorites():
+    favorites = {"ozet": "Ozetle"}
+    completer = _completer(favorites=favorites)
+
+    assert _complete(completer, "/fav o") == ["ozet"]
+
+    favorites["ornek"] = "Ornek ver"
+    assert _complete(completer, "/fav o") == ["ornek", "ozet"]
+
+
+def test_completer_matches_model_names():
+    completer = _completer(models=[{"name": "llama3:8b"}, {"name": "qwen2:7b"}])
+
+    assert _complete(completer, "/pull ll") == ["llama3:8b"]
+
+
+def test_completer_dispatches_on_command_token():
+    completer = _completer()
+
+    assert _complete(completer, "/prompts a") == ["add"]
+    assert _complete(completer, "/md o") == ["off", "on"]
+    assert _complete(completer, "/unknown a") == []
+    assert _complete(completer, "merhaba /m") == []
+
+
+def test_completer_refresh_models_keeps_command_trie():
+    completer = _completer(models=[{"name": "llama3:8b"}])
+    command_trie = completer._command_trie
+
+    completer.refresh_models([{"name": "qwen2:7b"}])
+
+    assert _complete(completer, "/pull ") == ["qwen2:7b"]
+    assert completer._command_trie is command_trie
+
+
+def _template_app(prompt):
+    app = MagicMock()
+    app.theme = {"accent": "cyan", "muted": "dim", "error": "red"}
+    app.favorites.templates = {"ceviri": SimpleNamespace(name="Ceviri", prompt=prompt)}
+    return app
+
+
+def test_template_fills_arguments_and_asks_once_per_variable():
+    app = _template_app("{dil} diline cevir: {metin} ({metin})")
+    app.session.prompt.return_value = "merhaba"
+
+    CommandHandlers(app).cmd_template("/tpl ceviri dil=Ingilizce")
+
+    app.session.prompt.assert_called_once()
+    app.chat_engine.send_user_message.assert_called_once_with(
+        "Ingilizce diline cevir: merhaba (merhaba)"
+    )
+
+
+def _session_app():
+    app = _template_app("")
+    app.theme["success"] = "green"
+    app.session_store.list_sessions.return_value = [
+        SimpleNamespace(id="a1", title="Ilk", tags=["is"])
+    ]
+    return app
+
+
+def test_session_number_errors_are_reported():
+    app = _session_app()
+    handlers = CommandHandlers(app)
+
+    handlers.cmd_session("/session open x")
+    handlers.cmd_session("/session open 5")
+    handlers.cmd_session("/session tag 1")
+
+    printed = [call.args[0] for call in app.console.print.call_args_list]
+    assert "Gecersiz numara" in printed[0]
+    assert "Gecersiz secim" in printed[1]
+    assert "/session tag <no> <etiket>" in printed[2]
+    app._load_session.assert_not_called()
+
+
+def test_session_open_loads_selected_session():
+    app = _session_app()
+
+    CommandHandlers(app).cmd_session("/session open 1")
+
+    app._load_session.assert_called_once_with(
+        app.session_store.list_sessions.return_value[0]
+    )
+
+
+def test_template_arguments_are_not_prompted():
+    app = _template_app("{dil}: {metin} {dil}")
+
+    CommandHandlers(app).cmd_template('/tpl ceviri dil="Alman" metin=selam')
+
+    app.session.prompt.assert_not_called()
+    app.chat_engine.send_user_message.assert_called_once_with("Alman: selam Alman")
+
+
+def test_session_tag_appends_once_and_keeps_order():
+    app = _session_app()
+    handlers = CommandHandlers(app)
+
+    handlers.cmd_session("/session tag 1 ev")
+    handlers.cmd_session("/session tag 1 is")
+
+    app.session_store.update_tags.assert_called_once_with("a1", ["is", "ev"])
+
+
+def test_session_untag_skips_missing_tag():
+    app = _session_app()
+    handlers = CommandHandlers(app)
+
+    handlers.cmd_session("/session untag 1 yok")
+    handlers.cmd_session("/session untag 1 is")
+
+    app.session_store.update_tags.assert_called_once_with("a1", [])
+
+
+def _bench_app(concurrent):
+    app = MagicMock()
+    app.config.benchmark_prompt = "soru"
+    app.config.benchmark_runs = 2
+    app.config.benchmark_concurrent = concurrent
+    app.config.benchmark_workers = 4
+    app.theme = {
+        "muted": "dim",
+        "primary": "blue",
+        "accent": "cyan",
+        "success": "green",
+    }
+    app.model_names = ["a", "b", "c"]
+
+    def bench(name, prompt, runs, quiet=False, workers=None):
+        if name == "b":
+            return None
+        return {
+            "model": name,
+            "runs": runs,
+            "avg_elapsed": 1.0,
+            "avg_prompt_tokens": 1,
+            "avg_completion_tokens": 1,
+            "avg_total_tokens": 2,
+            "avg_tps": 1.0,
+            "batch": 1,
+            "throughput_tps": 1.0,
+        }
+
+    app.ui_display.benchmark_model.side_effect = bench
+    return app
+
+
+def test_bench_all_runs_models_in_parallel_when_enabled():
+    app = _bench_app(concurrent=True)
+    app.console = Console(file=io.StringIO(), width=160)
+
+    CommandHandlers(app).cmd_bench("/bench all")
+
+    calls = app.ui_display.benchmark_model.call_args_list
+    assert sorted(call.args[0] for call in calls) == ["a", "b", "c"]
+    assert all(call.kwargs == {"quiet": True, "workers": 1} for call in calls)
+    output = app.console.file.getvalue()
+    assert "Benchmark Sonucu" in output
+    rows = [line.split() for line in output.splitlines() if "1.00" in line]
+    assert [row[2] for row in rows] == ["a", "c"]
+
+
+def test_bench_all_keeps_requests_within_worker_budget(
+    mock_config, mock_console, logger, mock_favorites, mock_prompts, mock_theme
+):
+    mock_config.benchmark_concurrent = True
+    mock_config.benchmark_workers = 2
+    mock_config.benchmark_runs = 3
+    display = UIDisplay(
+        config=mock_config,
+        console=mock_console,
+        logger=logger,
+        favorites=mock_favorites,
+        prompts=mock_prompts,
+        token_stats=TokenStats(),
+        get_theme=lambda: mock_theme,
+    )
+    lock = threading.Lock()
+    in_flight = {"now": 0, "peak": 0}
+
+    def run(model_name, prompt, run):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return {
+            "run": run,
+            "elapsed": 1.0,
+            "prompt_tokens": 1,
+            "completion_tokens": 1,
+            "total_tokens": 2,
+            "tps": 1.0,
+        }
+
+    display._benchmark_run = run
+    app = MagicMock()
+    app.config = mock_config
+    app.theme = mock_theme
+    app.model_names = ["a", "b", "c"]
+    app.ui_display = display
+    app.console = Console(file=io.StringIO(), width=160)
+
+    CommandHandlers(app).cmd_bench("/bench all")
+
+    assert in_flight["peak"] == 2
+
+
+def test_bench_all_interrupt_cancels_queued_models(monkeypatch):
+    app = _bench_app(concurrent=True)
+    app.config.benchmark_workers = 1
+    app.console = Console(file=io.StringIO(), width=160)
+    started = []
+
+    def bench(name, prompt, runs, quiet=False, workers=None):
+        started.append(name)
+        if name != "a":
+            time.sleep(0.5)
+        return {"model": name}
+
+    def interrupt(self, summary):
+        raise KeyboardInterrupt
+
+    app.ui_display.benchmark_model.side_effect = bench
+    monkeypatch.setattr(CommandHandlers, "_bench_panel", interrupt)
+    begin = time.perf_counter()
+
+    with pytest.raises(KeyboardInterrupt):
+        CommandHandlers(app).cmd_bench("/bench all")
+
+    assert time.perf_counter() - begin < 0.4
+    assert "c" not in started
+
+
+def test_bench_panel_keeps_model_order():
+    app = _bench_app(concurrent=False)
+
+    CommandHandlers(app).cmd_bench("/bench all")
+
+    table = app.console.print.call_args_list[-2].args[0].renderable
+    assert table.columns[0]._cells == ["a", "c"]
+
+
+def test_bench_all_is_sequential_by_default():
+    app = _bench_app(concurrent=False)
+
+    CommandHandlers(app).cmd_bench("/bench all")
+
+    calls = app.ui_display.benchmark_model.call_args_list
+    assert [call.args for call in calls] == [
+        ("a", "soru", 2),
+        ("b", "soru", 2),
+        ("c", "soru", 2),
+    ]
+
+
+def test_command_arg_skips_command_word():
+    assert _command_arg("/bench  all soru ") == "all soru"
+    assert _command_arg("/tpl ceviri") == "ceviri"
+    assert _command_arg("/bench") == ""
+
+
+def test_quick_checks_cached_model_names():
+    app = MagicMock()
+    app.theme = {"success": "green", "error": "red", "muted": "dim"}
+    app.model_names = ["llama3", "qwen"]
+    app.model_names_set = frozenset(app.model_names)
+    handlers = CommandHandlers(app)
+
+    handlers.cmd_quick("/quick qwen")
+    assert app.model == "qwen"
+
+    handlers.cmd_quick("/quick yok")
+    assert app.model == "qwen"
+    assert "llama3, qwen" in app.console.print.call_args_list[-1].args[0]
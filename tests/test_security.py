@@ -1,4 +1,11 @@
-from ollama_cli.security import decrypt_text, encrypt_text, generate_key, mask_sensitive_text
+from ollama_cli.security import (
+    _compile_patterns,
+    decrypt_text,
+    encrypt_text,
+    generate_key,
+    mask_messages,
+    mask_sensitive_text,
+)
 
 
 def test_mask_sensitive_text():
@@ -7,6 +14,21 @@ def test_mask_sensitive_text():
     assert "REDACTED" in masked
 
 
+def test_mask_messages_reuses_compiled_patterns():
+    patterns = [r"api_key=[A-Za-z0-9]+", r"\d{4}-\d{4}"]
+    _compile_patterns.cache_clear()
+    messages = [
+        {"role": "user", "content": "api_key=SECRET and 1234-5678"},
+        {"role": "user", "content": ["image"]},
+    ]
+    masked = mask_messages(messages, patterns)
+    mask_messages(messages, patterns)
+    assert masked[0]["content"] == "[REDACTED] and [REDACTED]"
+    assert masked[1]["content"] == ["image"]
+    assert messages[0]["content"] == "api_key=SECRET and 1234-5678"
+    assert _compile_patterns.cache_info().misses == 1
+
+
 def test_encrypt_roundtrip():
     key = generate_key()
     cipher = encrypt_text("hello", key)
@@ -1,6 +1,6 @@
 from ollama_cli.logging_utils import setup_logging
 from ollama_cli.models import ConfigModel
-from ollama_cli.session_store import SessionStore
+from ollama_cli.session_store import SessionStore, format_display_time
 from ollama_cli.storage import resolve_paths
 
 
@@ -31,3 +31,60 @@ def test_session_store_save_load(tmp_path, monkeypatch):
     assert data is not None
     assert data.meta.title == "Test"
     assert data.messages[0]["content"] == "Merhaba"
+
+
+def test_session_meta_has_display_time(tmp_path, monkeypatch):
+    monkeypatch.setenv("OLLAMA_CLI_HOME", str(tmp_path))
+    paths = resolve_paths()
+    logger = setup_logging(paths.log_file, diagnostic=False)
+    config = ConfigModel()
+    config.encryption_enabled = False
+
+    store = SessionStore(paths, logger, config)
+    meta = store.save_session(
+        session_id=None,
+        title="Test",
+        model="demo",
+        messages=[{"role": "user", "content": "Merhaba"}],
+        token_stats={"total_tokens": 0},
+        tags=[],
+        summary="",
+        show_log=False,
+    )
+
+    assert meta.updated_display == format_display_time(meta.updated_at)
+    assert store.update_title(meta.id, "Yeni")
+    listed = store.list_sessions()[0]
+    assert listed.updated_display == format_display_time(listed.updated_at)
+
+
+def test_format_display_time_falls_back_to_raw():
+    assert format_display_time("2024-01-02T03:04:05") == "2024-01-02 03:04"
+    assert format_display_time("bozuk") == "bozuk"
+
+
+def test_session_format_falls_back_to_json(tmp_path, monkeypatch):
+    monkeypatch.setenv("OLLAMA_CLI_HOME", str(tmp_path))
+    monkeypatch.setattr("ollama_cli.session_store.msgpack", None)
+    paths = resolve_paths()
+    logger = setup_logging(paths.log_file, diagnostic=False)
+    config = ConfigModel()
+    config.encryption_enabled = False
+    config.session_format = "msgpack"
+
+    store = SessionStore(paths, logger, config)
+    meta = store.save_session(
+        session_id=None,
+        title="Test",
+        model="demo",
+        messages=[{"role": "user", "content": "Merhaba"}],
+        token_stats={"total_tokens": 0},
+        tags=[],
+        summary="",
+        show_log=False,
+    )
+
+    assert meta.path.endswith(".json")
+    data = store.load_session(meta.id)
+    assert data is not None
+    assert data.messages[0]["content"] == "Merhaba"
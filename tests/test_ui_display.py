@@ -1,5 +1,8 @@
 """Tests for ui_display module."""
 
+import json
+import time
+
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -266,6 +269,49 @@ class TestExportChat:
         assert result is not None
         assert result.exists()
         assert result.suffix == ".json"
+        exported = json.loads(result.read_text(encoding="utf-8"))
+        assert exported["title"] == "Test Chat"
+        assert exported["messages"] == messages
+        assert '\n  "model": "test-model"' in result.read_text(encoding="utf-8")
+
+    def test_export_chat_reuses_resolved_directory(
+        self,
+        tmp_path,
+        mock_console,
+        logger,
+        mock_favorites,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+        mock_config,
+    ):
+        mock_config.save_directory = str(tmp_path / "first")
+        mock_config.mask_sensitive = False
+        mock_config.encrypt_exports = False
+
+        display = UIDisplay(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            favorites=mock_favorites,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+        messages = [{"role": "user", "content": "Hello"}]
+
+        with patch.object(
+            Path, "mkdir", autospec=True, side_effect=Path.mkdir
+        ) as mkdir:
+            display.export_chat("txt", messages, "test-model", "Test Chat")
+            display.export_chat("md", messages, "test-model", "Test Chat")
+            assert mkdir.call_count == 1
+
+            mock_config.save_directory = str(tmp_path / "second")
+            result = display.export_chat("txt", messages, "test-model", "Test Chat")
+            assert mkdir.call_count == 2
+
+        assert result.parent == tmp_path / "second"
 
     def test_export_chat_txt(
         self,
@@ -521,7 +567,7 @@ class TestFormatHtmlContent:
 class TestBenchmarkModel:
     """Tests for model benchmarking."""
 
-    @patch("ollama_cli.ui_display.requests.post")
+    @patch("ollama_cli.ui_display.requests.Session.post")
     def test_benchmark_model_success(
         self,
         mock_post,
@@ -559,8 +605,9 @@ class TestBenchmarkModel:
         assert result["runs"] == 2
         assert "avg_elapsed" in result
         assert "avg_tps" in result
+        assert result["batch"] == 1
 
-    @patch("ollama_cli.ui_display.requests.post")
+    @patch("ollama_cli.ui_display.requests.Session.post")
     def test_benchmark_model_failure(
         self,
         mock_post,
@@ -588,11 +635,92 @@ class TestBenchmarkModel:
 
         assert result is None
 
+    @patch("ollama_cli.ui_display.requests.Session.post")
+    def test_benchmark_model_concurrent(
+        self,
+        mock_post,
+        mock_config,
+        mock_console,
+        logger,
+        mock_favorites,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "message": {"content": "Test response"},
+            "prompt_eval_count": 50,
+            "eval_count": 100,
+        }
+        mock_post.return_value = mock_response
+        mock_config.benchmark_concurrent = True
+        mock_config.benchmark_workers = 2
+        saved = []
+
+        display = UIDisplay(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            favorites=mock_favorites,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+
+        result = display.benchmark_model(
+            "test-model", "Test prompt", runs=4, save_benchmark=saved.append
+        )
+
+        assert result is not None
+        assert result["runs"] == 4
+        assert mock_post.call_count == 4
+        assert sorted(r["run"] for r in saved) == [1, 2, 3, 4]
+        assert result["batch"] == 2
+        assert result["throughput_tps"] > 0
+
+    def test_benchmark_model_interrupt_cancels_queued_runs(
+        self,
+        mock_config,
+        mock_console,
+        logger,
+        mock_favorites,
+        mock_prompts,
+        mock_token_stats,
+        mock_theme,
+    ):
+        mock_config.benchmark_concurrent = True
+        mock_config.benchmark_workers = 2
+        started = []
+
+        display = UIDisplay(
+            config=mock_config,
+            console=mock_console,
+            logger=logger,
+            favorites=mock_favorites,
+            prompts=mock_prompts,
+            token_stats=mock_token_stats,
+            get_theme=lambda: mock_theme,
+        )
+
+        def run(model_name, prompt, run):
+            started.append(run)
+            if run == 1:
+                raise KeyboardInterrupt
+            time.sleep(0.3)
+
+        display._benchmark_run = run
+
+        with pytest.raises(KeyboardInterrupt):
+            display.benchmark_model("test-model", "Test prompt", runs=4)
+
+        assert 4 not in started
+
 
 class TestCompareModels:
     """Tests for model comparison."""
 
-    @patch("ollama_cli.ui_display.requests.post")
+    @patch("ollama_cli.ui_display.requests.Session.post")
     def test_compare_models_success(
         self,
         mock_post,
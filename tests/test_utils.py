@@ -1,4 +1,17 @@
-from ollama_cli.utils import estimate_message_tokens, get_model_prompt
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ollama_cli import utils
+from ollama_cli.utils import (
+    NDJSON_CHUNK_SIZE,
+    estimate_message_tokens,
+    estimate_tokens,
+    get_model_prompt,
+    iter_ndjson_lines,
+    json_loads,
+)
 
 
 def test_get_model_prompt_default():
@@ -10,3 +23,36 @@ def test_get_model_prompt_default():
 def test_estimate_message_tokens():
     msg = {"content": "hello world"}
     assert estimate_message_tokens(msg) > 0
+
+
+def test_estimate_message_tokens_matches_text_estimate():
+    for text in ["", "a", "abcd", "x" * 41]:
+        assert estimate_message_tokens({"content": text}) == estimate_tokens(text)
+    assert estimate_message_tokens({"content": ["img"]}) == 256
+    assert estimate_message_tokens({"content": None}) == 0
+
+
+def test_iter_ndjson_lines_joins_split_chunks():
+    response = MagicMock()
+    response.iter_content.return_value = [b'{"a": 1}\n{"b"', b"", b': 2}\n\n{"c": 3}']
+    assert list(iter_ndjson_lines(response)) == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+    response.iter_content.assert_called_once_with(chunk_size=NDJSON_CHUNK_SIZE)
+
+
+def test_json_loads_uses_simdjson_without_orjson():
+    fake = MagicMock()
+    fake.loads.return_value = {"done": True}
+
+    with patch.object(utils, "orjson", None), patch.object(utils, "simdjson", fake):
+        assert json_loads(b'{"done": true}') == {"done": True}
+
+    fake.loads.assert_called_once_with(b'{"done": true}')
+
+
+def test_json_loads_normalizes_simdjson_errors():
+    fake = MagicMock()
+    fake.loads.side_effect = ValueError("bozuk")
+
+    with patch.object(utils, "orjson", None), patch.object(utils, "simdjson", fake):
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(b"{")